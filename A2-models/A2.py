@@ -5,193 +5,446 @@ import networkx as nx
 import math
 import matplotlib.pyplot as plt
 import numpy as np
+import os
 import random
-import sklearn
+import sys
+
+import degree_stats
+
+#figures.py is shared with A4-dynamics, in the common folder at the root of the repository
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common import figures
+
+def show_or_render(draw, data, out_file=None, batch=None):
+    """ Shows draw(ax, **data) interactively, or saves it without pyplot when out_file is given.
+
+    Keyword arguments:
+    out_file -- image file (default None, show the figure)
+    batch -- figures.FigureBatch to add the figure to, rendered later in parallel (default None)
+    """
+    if batch is not None:
+        batch.add(out_file, draw, **data)
+    elif out_file is not None:
+        figures.render(out_file, draw, **data)
+    else:
+        _, ax = plt.subplots()
+        draw(ax, **data)
+        plt.show()
 
 #%% [markdown]
 # #### Erdös-Rényi (ER) networks
 
 #%%
-def erdos_renyi_gen(n,p):
+def erdos_renyi_edges(n, p, seed=None):
+    """ Returns the edges of a G(n,p) graph as an (m x 2) array in O(n+m).
+
+    The n(n-1)/2 pairs (w, v), w < v, are numbered v(v-1)/2 + w and the gaps between
+    consecutive edges are geometric (Batagelj-Brandes), drawn in vectorized chunks and
+    decoded back to pairs.
+    """
+    rng = np.random.default_rng(seed)
+    n_pairs = n * (n - 1) // 2
+
+    if p <= 0 or n_pairs == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    if p >= 1:
+        idx = np.arange(n_pairs, dtype=np.int64)
+    else:
+        chunks = []
+        last = -1
+        chunk_size = int(1.05 * p * n_pairs) + 1024
+        while last < n_pairs:
+            pos = last + np.cumsum(rng.geometric(p, size=chunk_size))
+            chunks.append(pos)
+            last = pos[-1]
+        idx = np.concatenate(chunks)
+        idx = idx[idx < n_pairs]
+
+    #Pair decoding, with an integer correction of the floating point square root
+    v = ((1 + np.sqrt(1 + 8 * idx.astype(float))) // 2).astype(np.int64)
+    v -= v * (v - 1) // 2 > idx
+    v += (v + 1) * v // 2 <= idx
+    w = idx - v * (v - 1) // 2
+
+    return np.column_stack((w, v))
+
+def erdos_renyi_gen(n, p, arrays=False, seed=None):
+    edges = erdos_renyi_edges(n, p, seed)
+    if arrays:
+        return edges
+
     net = nx.Graph()
-    for node in range(0,n):
-        net.add_node(node)
-    
-    for ini in range(0,n):
-        for end in range(ini+1, n):
-            if (p > 0 and random.random() <= p):
-                net.add_edge(ini, end)
+    net.add_nodes_from(range(n))
+    net.add_edges_from(edges.tolist())
+
     return net
 
-def erdos_renyi_gen_plot(n,p):
-    net = erdos_renyi_gen(n, p)
+def draw_erdos_renyi(ax, n, p, k, k_theo, h, h_theo):
+    ax.plot(np.asarray(h)/float(sum(h)), 's-', label='Actual data')
+    ax.axvline(x=k, ls='dashed', label=f'Experimental <k>={k}')
+    ax.plot(h_theo, 'o-', color='r', label='Poisson approximation')
+    ax.axvline(x=k_theo, color='r', ls='dashed', label=f'Theoretical <k>={k_theo}')
+    ax.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
+    
+    ax.set_xlabel('Degree')
+    ax.set_ylabel('Frequency')
+
+    ax.set_title(f'Erdös-Rényi N={n} and p={p}')
+    ax.grid(True)
 
-    # nx.draw(net)
-    # plt.show()
+def erdos_renyi_gen_plot(n, p, out_file=None, batch=None):
+    edges = erdos_renyi_edges(n, p)
 
     # Actual and theoretical average degree
-    k = sum([d[1] for d in net.degree()])/n
+    k = 2*len(edges)/n
     k_theo = p*(n-1)
     
     # Actual and theoretical degree distribution
-    h = nx.degree_histogram(net)
+    h = degree_stats.degree_histogram(edges, n)
     h_theo = []
 
     for deg in range(len(h)):
         #Poisson distribution
         h_theo.append(math.exp(-k_theo)*k_theo**deg/math.factorial(deg))
 
-    plt.plot(np.asarray(h)/float(sum(h)), 's-', label='Actual data')
-    plt.axvline(x=k, ls='dashed', label=f'Experimental <k>={k}')
-    plt.plot(h_theo, 'o-', color='r', label='Poisson approximation')
-    plt.axvline(x=k_theo, color='r', ls='dashed', label=f'Theoretical <k>={k_theo}')
-    plt.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
-    
-    plt.xlabel('Degree')
-    plt.ylabel('Frequency')
-
-    plt.title(f'Erdös-Rényi N={n} and p={p}')
-    plt.grid(True)
-
-    plt.show() 
+    show_or_render(draw_erdos_renyi, dict(n=n, p=p, k=k, k_theo=k_theo, h=h, h_theo=h_theo), out_file, batch)
 
 #%% [markdown]
 # #### Watts-Strogatz model (WS)
 
 #%%
-def watts_strogatz_gen(n, k, p):
+def _sorted_contains(sorted_parts, keys):
+    """ Membership of keys in the union of a list of sorted arrays. """
+    result = np.zeros(len(keys), dtype=bool)
+    for sorted_keys in sorted_parts:
+        if len(sorted_keys) > 0:
+            pos = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+            result |= sorted_keys[pos] == keys
+    return result
+
+def watts_strogatz_edges(n, k, p, seed=None, max_rounds=100, chunk_size=2**22):
+    """ Returns the edges of a Watts-Strogatz graph as an (E x 2) array.
+
+    The ring lattice (each node linked to its k/2 following nodes) is built as an array and
+    the edges to rewire are chosen with one vectorized Bernoulli draw. Each rewired edge keeps
+    its first node and gets a uniform new end; self-loops, its old end and edges already in the
+    graph are redrawn in bulk, round after round, chunk_size edges at a time to bound memory.
+    Lattice edges are looked up by position (edge i·k/2 + s-1 joins i and i+s) and the rewired
+    ones in sorted arrays of keys min·n + max. An edge that still has no valid end after
+    max_rounds keeps its original end.
+    """
     if (k >= n): 
         raise Exception('Invalid value for k. k must be less than n')
 
-    net = nx.Graph()
+    rng = np.random.default_rng(seed)
     k_2 = math.floor(k / 2)
-    edge_list = []
+    dtype = np.int32 if n < 2**31 else np.int64
+
+    src = np.repeat(np.arange(n, dtype=dtype), k_2)
+    dst = (src + np.tile(np.arange(1, k_2 + 1, dtype=dtype), n)) % n
+
+    def key(a, b):
+        a = a.astype(np.int64)
+        b = b.astype(np.int64)
+        return np.minimum(a, b) * n + np.maximum(a, b)
+
+    def is_kept_lattice_edge(a, b):
+        #a -> b is the lattice edge a*k_2 + (d-1) when b = a + d (mod n), 1 <= d <= k_2 (and the same from b)
+        result = np.zeros(len(a), dtype=bool)
+        for x, y in ((a, b), (b, a)):
+            d = (y.astype(np.int64) - x) % n
+            lattice = (d >= 1) & (d <= k_2)
+            idx = x[lattice].astype(np.int64) * k_2 + d[lattice] - 1
+            result[lattice] |= ~rewire[idx]
+        return result
+
+    rewire = rng.random(len(src)) < p
+    new_dst = dst.copy()
+
+    accepted = [] #sorted keys of the rewired edges, one array per chunk
+    not_rewired = []
+
+    rewired = np.flatnonzero(rewire)
+    for start in range(0, len(rewired), chunk_size):
+        pending = rewired[start:start + chunk_size]
+        chunk_accepted = []
+
+        for _ in range(max_rounds):
+            if len(pending) == 0:
+                break
 
-    for node in range(0,n):
-        for node_pos_shift in range(1, k_2 + 1):
-            edge_list.append([node, (node + node_pos_shift) % n])
+            u = src[pending]
+            candidates = rng.integers(0, n, size=len(pending), dtype=dtype)
+            keys = key(u, candidates)
 
-    net.add_edges_from(edge_list)
+            valid = (candidates != u) & (candidates != dst[pending])
+            valid &= ~is_kept_lattice_edge(u, candidates)
+            valid &= ~_sorted_contains(accepted + chunk_accepted, keys)
 
-    for edge in edge_list:
-        if (p > 0 and random.random() < p):
-            new_to = random.randint(0, n-1)
+            #Two rewired edges may pick the same new edge in a round: keep the first one
+            unique_keys, first = np.unique(keys[valid], return_index=True)
+            chosen = np.flatnonzero(valid)[first]
 
-            while new_to == edge[1] or net.has_edge(edge[0], new_to):
-                new_to = random.randint(0, n-1)
+            new_dst[pending[chosen]] = candidates[chosen]
+            chunk_accepted.append(unique_keys)
 
-            if net.degree(edge[0]) >= n - 1:
-                break
-            else:
-                net.remove_edge(edge[0], edge[1])
-                net.add_edge(edge[0], new_to)
+            done = np.zeros(len(pending), dtype=bool)
+            done[chosen] = True
+            pending = pending[~done]
+
+        accepted.append(np.sort(np.concatenate(chunk_accepted)) if chunk_accepted else np.zeros(0, dtype=np.int64))
+        not_rewired.append(pending)
+
+    #Edges that could not be rewired keep their original end (unless it has been taken meanwhile)
+    pending = np.concatenate(not_rewired) if not_rewired else np.zeros(0, dtype=np.int64)
+    if len(pending) > 0:
+        drop = pending[_sorted_contains(accepted, key(src[pending], dst[pending]))]
+        keep = np.ones(len(src), dtype=bool)
+        keep[drop] = False
+        src, new_dst = src[keep], new_dst[keep]
+
+    return np.column_stack((src, new_dst))
+
+def watts_strogatz_gen(n, k, p, arrays=False, seed=None):
+    edges = watts_strogatz_edges(n, k, p, seed)
+    if arrays:
+        return edges
+
+    net = nx.Graph()
+    net.add_nodes_from(range(n))
+    net.add_edges_from(edges.tolist())
     
     return net
 
-def watts_strogatz_plot(n, k, p):
-    net = watts_strogatz_gen(n, k, p)
+def draw_watts_strogatz(ax, n, k, p, h, h_theo):
+    ax.plot(np.asarray(h)/float(sum(h)), 's-', label='Actual data')
+    ax.plot(h_theo, 'o-', color='r', label='Poisson approximation')
+    
+    ax.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
+    
+    ax.set_xlabel('Degree')
+    ax.set_ylabel('Frequency')
+
+    ax.set_title(f'Watts-Strogatz N={n}, k={k} and p={p}')
+    ax.grid(True)
 
-    h = nx.degree_histogram(net)
+def watts_strogatz_plot(n, k, p, out_file=None, batch=None):
+    h = degree_stats.degree_histogram(watts_strogatz_edges(n, k, p), n)
     h_theo = []
 
     for deg in range(len(h)):
         #Poisson distribution
         h_theo.append(math.exp(-k)*k**deg/math.factorial(deg))
 
-    plt.plot(np.asarray(h)/float(sum(h)), 's-', label='Actual data')
-    plt.plot(h_theo, 'o-', color='r', label='Poisson approximation')
-    
-    plt.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
-    
-    plt.xlabel('Degree')
-    plt.ylabel('Frequency')
-
-    plt.title(f'Watts-Strogatz N={n}, k={k} and p={p}')
-    plt.grid(True)
-    plt.show()
+    show_or_render(draw_watts_strogatz, dict(n=n, k=k, p=p, h=h, h_theo=h_theo), out_file, batch)
 
 
 #%% [markdown]
 # ##### Barabási-Albert model (BA)
 
 #%%
-def barabasi_albert_gen(n, m0, m):
+def barabasi_albert_edges(n, m0, m, seed=None):
+    """ Returns the edges of a Barabási-Albert graph as an (E x 2) array in O(n·m).
+
+    The seed is a ring of m0 nodes, each one linked to the next two. The edge endpoints are
+    kept in a flat list where every node appears once per edge (its degree), so choosing a
+    uniform position of the list is a degree-proportional choice; repeated targets of the
+    same new node are redrawn. The same list, read in pairs, is the edge list.
+    """
     if (m0 > n):
         raise Exception('m0 must be equal or less than n.')
 
     if (m > m0):
         raise Exception('m must be equal or less than m0.')
 
-    net = nx.Graph()
-
-    for node in range(0,m0):
-        #print(f'Adding node {node}')
-        net.add_node(node)
+    rng = random.Random(seed)
 
     #Generating a list (circular) with m0 nodes
-    edge_list = []
-    for node in range(0,m0):
-        for node_pos_shift in range(1, 3):
-            edge_list.append([node, (node + node_pos_shift) % m0])
+    ring = {tuple(sorted((node, (node + node_pos_shift) % m0))) for node in range(0, m0) for node_pos_shift in range(1, 3)}
+    repeated = [node for edge in sorted(ring) if edge[0] != edge[1] for node in edge]
+
+    for new_node in range(m0, n):
+        size = len(repeated)
+        targets = []
+        while len(targets) < m:
+            #Uniform choice while there are no edges yet
+            node = repeated[int(rng.random() * size)] if size > 0 else rng.randrange(new_node)
+            if node not in targets:
+                targets.append(node)
 
-    net.add_edges_from(edge_list)
+        for node in targets:
+            repeated.append(new_node)
+            repeated.append(node)
 
-    while m0 < n:    
-        distr_degree = []
-        for degree in net.degree():
-            distr_degree += [degree[0]] * degree[1]
+    return np.array(repeated, dtype=np.int64).reshape(-1, 2)
 
-        for _ in range(0, m):
-            node = random.choice(distr_degree)
-            distr_degree = [item for item in distr_degree if item != node]
+def barabasi_albert_gen(n, m0, m, arrays=False, seed=None):
+    edges = barabasi_albert_edges(n, m0, m, seed)
+    if arrays:
+        return edges
 
-            net.add_node(m0)
-            net.add_edge(m0, node)     
-        m0 += 1
+    net = nx.Graph()
+    net.add_nodes_from(range(n))
+    net.add_edges_from(edges.tolist())
 
     return net
 
-def barabasi_albert_plot(n, m0, m):
-    net = barabasi_albert_gen(n,m0,m)
+def draw_barabasi_albert(ax, n, m0, m, ks, pk, k_fit, p_fit, gamma, k_min):
+    ax.scatter(ks, pk, color='blue', label='Actual data')
+    ax.plot(k_fit, p_fit, color='black', linewidth=2, label=f'MLE fit (k_min={k_min})')
+    ax.set_xscale('log')
+    ax.set_yscale('log')
 
-    degree_histogram = nx.degree_histogram(net)
-    
-    h_ = [i for i in degree_histogram if i>0]
-    degreedistribution = np.asarray([math.log(float(i)/sum(h_)) for i in h_])
-    d_ = np.asarray([math.log(i) for i in range(len(degree_histogram)) if degree_histogram[i]>0]).reshape((len(h_),1))
-    lr = sklearn.linear_model.LinearRegression()
-    lr.fit(d_, degreedistribution)
-    gamma = -lr.coef_
-
-    plt.scatter([math.exp(i) for i in d_], [math.exp(j) for j in degreedistribution],  color='blue', label='Actual data')
-    plt.plot([math.exp(i) for i in d_], [math.exp(j) for j in lr.predict(d_)], color='black', linewidth=2, label='Regression')
-    plt.xscale('log')
-    plt.yscale('log')
-
-    plt.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
-    plt.xlabel('Degree')
-    plt.ylabel('Frequency')
-    plt.title(f'Barabási-Albert N={n}, m0={m0} and {m}. Estimated γ={gamma}')
-    plt.grid(True)
-    plt.show()
+    ax.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
+    ax.set_xlabel('Degree')
+    ax.set_ylabel('Frequency')
+    ax.set_title(f'Barabási-Albert N={n}, m0={m0} and {m}. Estimated γ={gamma:.3f}')
+    ax.grid(True)
+
+def barabasi_albert_plot(n, m0, m, replicas=1, seed=None, out_file=None, batch=None):
+    """ Plots the degree distribution of `replicas` BA graphs (aggregated) and its power law fit. """
+    hist = degree_stats.DegreeHistogram()
+    for ss in np.random.SeedSequence(seed).spawn(replicas):
+        hist.add(barabasi_albert_edges(n, m0, m, seed=int(ss.generate_state(1)[0])), n)
+
+    gamma, k_min, _ = hist.fit()
+    ks = np.flatnonzero(hist.counts)
+    k_fit, p_fit = degree_stats.power_law_pdf(hist.counts, gamma, k_min)
+
+    show_or_render(draw_barabasi_albert, dict(n=n, m0=m0, m=m, ks=ks, pk=hist.pdf()[ks], k_fit=k_fit, p_fit=p_fit,
+                                              gamma=gamma, k_min=k_min), out_file, batch)
+
+#%% [markdown]
+# ##### Configuration model (CM)
+
+#%%
+def power_law_degrees(n, gamma, k_min=1, k_max=None, seed=None):
+    """ Samples n degrees from P(k) ~ k^-γ, k_min <= k <= k_max (default n-1), with an even sum. """
+    rng = np.random.default_rng(seed)
+    k_max = n - 1 if k_max is None else k_max
+
+    support = np.arange(k_min, k_max + 1)
+    probs = support.astype(float) ** -gamma
+    degrees = rng.choice(support, size=n, p=probs / probs.sum())
+
+    #Stubs must be paired: fix the parity with one more draw for a random node
+    while degrees.sum() % 2 == 1:
+        degrees[rng.integers(n)] = rng.choice(support, p=probs / probs.sum())
+
+    return degrees
+
+def _edge_keys(edges, n):
+    return np.minimum(edges[:, 0], edges[:, 1]).astype(np.int64) * n + np.maximum(edges[:, 0], edges[:, 1])
+
+def _simple_mask(edges, n):
+    """ True for the edges that are not self-loops nor repetitions of a previous edge. """
+    keys = _edge_keys(edges, n)
+    mask = edges[:, 0] != edges[:, 1]
+    first = np.zeros(len(edges), dtype=bool)
+    first[np.unique(keys, return_index=True)[1]] = True
+    return mask & first
+
+def configuration_model_edges(degrees, mode='erased', seed=None, max_rounds=100):
+    """ Returns the edges of a configuration model graph with the given degree sequence.
+
+    The stubs (node i repeated degrees[i] times) are shuffled and paired. mode:
+      - 'multigraph': the pairs as they are, with self-loops and multi-edges,
+      - 'erased': self-loops and repeated edges removed (the degrees may decrease),
+      - 'simple': self-loops and repeated edges are fixed with double edge swaps against
+        random valid edges ((a,b),(c,d) -> (a,c),(b,d)), done in vectorized rounds, so the
+        degree sequence is kept. Edges still invalid after max_rounds are erased.
+    """
+    rng = np.random.default_rng(seed)
+    degrees = np.asarray(degrees, dtype=np.int64)
+    n = len(degrees)
+
+    if degrees.sum() % 2 == 1:
+        raise Exception('The sum of the degrees must be even.')
+
+    stubs = np.repeat(np.arange(n, dtype=np.int32 if n < 2**31 else np.int64), degrees)
+    rng.shuffle(stubs)
+    edges = stubs.reshape(-1, 2)
+
+    if mode == 'multigraph':
+        return edges
+    if mode == 'erased':
+        return edges[_simple_mask(edges, n)]
+    if mode != 'simple':
+        raise Exception(f'Invalid mode {mode}. Use multigraph, erased or simple.')
+
+    for _ in range(max_rounds):
+        valid = _simple_mask(edges, n)
+        bad = np.flatnonzero(~valid)
+        good = np.flatnonzero(valid)
+        if len(bad) == 0 or len(good) == 0:
+            break
+
+        partners = good[rng.integers(0, len(good), size=len(bad))]
+        flip = rng.random(len(bad)) < .5
+        a, b = edges[bad, 0], edges[bad, 1]
+        c = np.where(flip, edges[partners, 1], edges[partners, 0])
+        d = np.where(flip, edges[partners, 0], edges[partners, 1])
+
+        first = np.column_stack((a, c))
+        second = np.column_stack((b, d))
+
+        #The swap must not create self-loops nor existing edges, and every edge is swapped once
+        existing = np.sort(_edge_keys(edges[good], n))
+        ok = (a != c) & (b != d)
+        for new in (first, second):
+            keys = _edge_keys(new, n)
+            pos = np.minimum(np.searchsorted(existing, keys), len(existing) - 1)
+            ok &= existing[pos] != keys
+        ok &= _edge_keys(first, n) != _edge_keys(second, n)
+        ok[ok] &= np.isin(np.arange(ok.sum()), np.unique(partners[ok], return_index=True)[1])
+        ok[ok] &= _simple_mask(np.concatenate((first[ok], second[ok])), n).reshape(2, -1).all(axis=0)
+
+        edges[partners[ok]] = first[ok]
+        edges[bad[ok]] = second[ok]
+
+    return edges[_simple_mask(edges, n)]
+
+def configuration_model_gen(degrees, mode='erased', arrays=False, seed=None):
+    edges = configuration_model_edges(degrees, mode, seed)
+    if arrays:
+        return edges
+
+    net = nx.MultiGraph() if mode == 'multigraph' else nx.Graph()
+    net.add_nodes_from(range(len(degrees)))
+    net.add_edges_from(edges.tolist())
+
+    return net
+
+def write_pajek_edges(edges, n, out_file):
+    """ Writes an edge array (0-based nodes) as a Pajek file without building a graph. """
+    with open(out_file, 'w') as f:
+        f.write(f'*Vertices {n}\n')
+        np.savetxt(f, np.column_stack((np.arange(1, n + 1), np.arange(n))), fmt='%d "%d"')
+        f.write('*Edges\n')
+        np.savetxt(f, np.asarray(edges) + 1, fmt='%d')
 
 #%% ER
-for n in [50, 100]:
-    for p in [.2, .5, .7]:
-        net = erdos_renyi_gen(n, p)
-        nx.write_pajek(net, f'./output/ER_n_{n}_p_{100*p}.net')
+#(only when run as a script or cell by cell, importing A2 must not write files. See generate.py for ensembles)
+if __name__ == '__main__':
+    for n in [50, 100]:
+        for p in [.2, .5, .7]:
+            net = erdos_renyi_gen(n, p)
+            nx.write_pajek(net, f'./output/ER_n_{n}_p_{100*p}.net')
 
 #%% WS
-for n in [50, 100]:
-    for p in [0, .1, .2, .5, 0.9, 1.0]:
-        watts_strogatz_gen(n, 4, p)
-        nx.write_pajek(net, f'./output/WS_n_{n}_p_{100*p}.net')
+if __name__ == '__main__':
+    for n in [50, 100]:
+        for p in [0, .1, .2, .5, 0.9, 1.0]:
+            net = watts_strogatz_gen(n, 4, p)
+            nx.write_pajek(net, f'./output/WS_n_{n}_p_{100*p}.net')
 
 #%% BA
-for n in [100]:
-    for m in [1, 2, 5]:
-        barabasi_albert_gen(n, n//2, m)
-        nx.write_pajek(net, f'./output/BA_n_{n}_m_{m}_m0_{n//2}.net')
+if __name__ == '__main__':
+    for n in [100]:
+        for m in [1, 2, 5]:
+            net = barabasi_albert_gen(n, n//2, m)
+            nx.write_pajek(net, f'./output/BA_n_{n}_m_{m}_m0_{n//2}.net')
 
 
 
@@ -228,6 +481,11 @@ for n in [100]:
 # nx.draw(net)
 
 #%% Degree Distributions
+#(to save a sweep of images instead, rendered in parallel and only when their data changed:
+# batch = figures.FigureBatch()
+# for p in [0, 0.5, 1]:
+#     watts_strogatz_plot(1000, 4, p, out_file=f'./plots/dd_watts_strogatz_n1000_k4_p{int(100*p)}.png', batch=batch)
+# batch.render())
 #erdos_renyi_gen_plot(1000, .05)
 #erdos_renyi_gen_plot(10000, .001)
 
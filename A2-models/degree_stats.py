@@ -0,0 +1,123 @@
+""" Degree statistics computed straight from edge arrays.
+
+Histograms come from np.bincount over the (E x 2) edge arrays returned by the generators
+(arrays=True), so no graph object is built, and DegreeHistogram adds them up replica by
+replica: averaging 100 BA graphs of n=10^5 only keeps one edge array and one histogram in
+memory at a time. The power law exponent is the discrete maximum likelihood estimate with
+k_min chosen by minimizing the Kolmogorov-Smirnov distance (Clauset, Shalizi and Newman).
+"""
+import numpy as np
+from scipy.optimize import minimize_scalar
+from scipy.special import zeta
+
+def degrees(edges, n):
+    """ Returns the degree of each one of the n nodes of an (E x 2) edge array. """
+    return np.bincount(np.asarray(edges).ravel(), minlength=n)
+
+def degree_histogram(edges, n):
+    """ Returns h, h[k] = number of nodes with degree k (as nx.degree_histogram). """
+    return np.bincount(degrees(edges, n))
+
+def _tail(hist, k_min):
+    ks = np.arange(k_min, len(hist))
+    return ks, np.asarray(hist[k_min:], dtype=float)
+
+def power_law_mle(hist, k_min):
+    """ Discrete maximum likelihood estimate of γ for the degrees k >= k_min of a histogram.
+
+    Maximizes L(γ) = -γ Σ ln k - n ln ζ(γ, k_min), with ζ the Hurwitz zeta function.
+
+    Keyword arguments:
+    hist -- degree histogram, hist[k] = number of nodes with degree k
+    k_min -- smallest degree following the power law (>= 1)
+    """
+    ks, counts = _tail(hist, k_min)
+    n_tail = counts.sum()
+    if n_tail == 0:
+        raise Exception(f'There are no degrees >= {k_min}')
+
+    sum_log = np.dot(counts, np.log(ks))
+    result = minimize_scalar(lambda gamma: gamma * sum_log + n_tail * np.log(zeta(gamma, k_min)),
+                             bounds=(1.0 + 1e-6, 10.0), method='bounded', options={'xatol': 1e-6})
+    return float(result.x)
+
+def ks_distance(hist, k_min, gamma):
+    """ Kolmogorov-Smirnov distance between the degrees k >= k_min and the fitted power law. """
+    ks, counts = _tail(hist, k_min)
+    empirical = np.cumsum(counts) / counts.sum()
+    model = 1.0 - zeta(gamma, ks + 1) / zeta(gamma, k_min)
+    return float(np.max(np.abs(empirical - model)))
+
+def fit_power_law(hist, k_min=None, min_tail=10):
+    """ Fits P(k) ~ k^-γ to the tail of a degree histogram and returns (γ, k_min, KS distance).
+
+    Keyword arguments:
+    hist -- degree histogram, hist[k] = number of nodes with degree k
+    k_min -- smallest degree following the power law (default the observed degree with the
+             smallest KS distance)
+    min_tail -- minimum number of nodes with degree >= k_min when choosing it (default 10)
+    """
+    hist = np.asarray(hist)
+
+    if k_min is not None:
+        gamma = power_law_mle(hist, k_min)
+        return gamma, k_min, ks_distance(hist, k_min, gamma)
+
+    #Number of nodes with degree >= k
+    tail_size = np.cumsum(hist[::-1])[::-1]
+    candidates = [k for k in np.flatnonzero(hist) if k >= 1 and tail_size[k] >= min_tail]
+    if not candidates:
+        raise Exception(f'There are less than {min_tail} nodes with degree >= 1')
+
+    best = None
+    for k in candidates:
+        gamma = power_law_mle(hist, k)
+        distance = ks_distance(hist, k, gamma)
+        if best is None or distance < best[2]:
+            best = (gamma, int(k), distance)
+
+    return best
+
+def power_law_pdf(hist, gamma, k_min):
+    """ Returns the degrees k >= k_min and the fitted P(k), scaled to the fraction of nodes in the tail. """
+    ks, counts = _tail(hist, k_min)
+    tail_fraction = counts.sum() / np.sum(hist)
+    return ks, tail_fraction * ks ** -gamma / zeta(gamma, k_min)
+
+class DegreeHistogram():
+    """ Degree histogram accumulated over the replicas of an ensemble.
+
+    Only the running sum of the per-replica histograms is kept; pdf() is the degree
+    distribution of all the nodes of all the replicas.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.replicas = 0
+        self.nodes = 0
+
+    def add(self, edges, n):
+        """ Adds the histogram of one graph, given as an (E x 2) edge array of n nodes. """
+        hist = degree_histogram(edges, n)
+        if len(hist) > len(self.counts):
+            self.counts = np.concatenate((self.counts, np.zeros(len(hist) - len(self.counts), dtype=np.int64)))
+        self.counts[:len(hist)] += hist
+        self.replicas += 1
+        self.nodes += n
+
+        return self
+
+    def add_file(self, path):
+        """ Adds a graph saved by generate.py with --format npz. """
+        with np.load(path) as data:
+            return self.add(data['edges'], int(data['n']))
+
+    def pdf(self):
+        return self.counts / max(self.nodes, 1)
+
+    def mean_degree(self):
+        return float(np.dot(np.arange(len(self.counts)), self.counts) / max(self.nodes, 1))
+
+    def fit(self, k_min=None, min_tail=10):
+        """ Power law fit of the aggregated histogram, see fit_power_law. """
+        return fit_power_law(self.counts, k_min, min_tail)
@@ -0,0 +1,103 @@
+""" Generates ensembles of model networks in parallel.
+
+Every combination of the given parameters is generated `--replicas` times in a pool of
+processes. Each (parameters, replica) task gets its own seed spawned from `--seed`, so the
+ensemble does not depend on the number of workers, and each graph is written to disk by
+the worker that generated it (Pajek .net or compressed .npz edge array), so the ensemble
+is never held in memory.
+
+Examples (from A2-models):
+    python generate.py ER --n 1000 10000 --p 0.001 0.01 --replicas 10
+    python generate.py WS --n 1000 --k 4 --p 0 0.1 0.5 1 --replicas 100 --workers 4
+    python generate.py BA --n 100000 --m0 50 --m 1 5 10 --replicas 100 --format npz
+    python generate.py CM --n 1000000 --gamma 2.5 2.7 --k-min 2 --mode simple
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import A2
+
+def configuration_model(n, gamma, k_min, k_max, mode, seed):
+    #Independent streams for the degree sequence and the stub matching
+    degree_seed, matching_seed = np.random.SeedSequence(seed).spawn(2)
+    degrees = A2.power_law_degrees(n, gamma, k_min, k_max, seed=degree_seed)
+
+    return A2.configuration_model_gen(degrees, mode, arrays=True, seed=matching_seed)
+
+#Generator and parameters of each model
+models = {
+    'ER': (lambda n, p, seed: A2.erdos_renyi_gen(n, p, arrays=True, seed=seed), ['n', 'p']),
+    'WS': (lambda n, k, p, seed: A2.watts_strogatz_gen(n, k, p, arrays=True, seed=seed), ['n', 'k', 'p']),
+    'BA': (lambda n, m0, m, seed: A2.barabasi_albert_gen(n, m0, m, arrays=True, seed=seed), ['n', 'm0', 'm']),
+    'CM': (configuration_model, ['n', 'gamma', 'k_min', 'k_max', 'mode']),
+}
+
+def out_name(model, params, replica):
+    return f'{model}_' + '_'.join(f'{name}_{value}' for name, value in params.items()) + f'_r{replica}'
+
+def generate(task):
+    """ Generates one graph, writes it and returns (file, number of edges). """
+    model, params, replica, seed, out_dir, out_format = task
+
+    generator, _ = models[model]
+    edges = generator(**params, seed=seed)
+
+    out_file = os.path.join(out_dir, out_name(model, params, replica) + '.' + out_format)
+    if out_format == 'net':
+        A2.write_pajek_edges(edges, params['n'], out_file)
+    else:
+        np.savez_compressed(out_file, n=params['n'], edges=edges)
+
+    return out_file, len(edges)
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel generation of model network ensembles')
+    parser.add_argument('model', choices=sorted(models))
+    parser.add_argument('--n', type=int, nargs='+', required=True, help='number of nodes')
+    parser.add_argument('--p', type=float, nargs='+', help='ER edge probability / WS rewiring probability')
+    parser.add_argument('--k', type=int, nargs='+', help='WS mean degree')
+    parser.add_argument('--m0', type=int, nargs='+', help='BA initial nodes')
+    parser.add_argument('--m', type=int, nargs='+', help='BA edges per new node')
+    parser.add_argument('--gamma', type=float, nargs='+', help='CM power law exponent')
+    parser.add_argument('--k-min', type=int, nargs='+', default=[1], help='CM minimum degree')
+    parser.add_argument('--k-max', type=int, nargs='+', default=[None], help='CM maximum degree (default n-1)')
+    parser.add_argument('--mode', nargs='+', default=['erased'], help='CM mode: multigraph, erased or simple')
+    parser.add_argument('--replicas', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default all the cores)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--format', choices=['net', 'npz'], default='net')
+    parser.add_argument('--out', default='./output')
+    args = parser.parse_args()
+
+    _, param_names = models[args.model]
+    values = []
+    for name in param_names:
+        value = getattr(args, name)
+        if value is None:
+            parser.error(f'--{name.replace("_", "-")} is required for {args.model}')
+        values.append(value)
+
+    grid = [dict(zip(param_names, combination)) for combination in itertools.product(*values)]
+    cells = [(params, replica) for params in grid for replica in range(args.replicas)]
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(args.seed).spawn(len(cells))]
+
+    if not os.path.exists(args.out):
+        os.makedirs(args.out)
+
+    tasks = [(args.model, params, replica, seed, args.out, args.format) for (params, replica), seed in zip(cells, seeds)]
+
+    if args.workers == 1:
+        results = map(generate, tasks)
+        for out_file, n_edges in results:
+            print(f'{out_file} - {n_edges} edges')
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            for out_file, n_edges in executor.map(generate, tasks):
+                print(f'{out_file} - {n_edges} edges')
+
+if __name__ == '__main__':
+    main()
@@ -1,35 +1,41 @@
-import networkx as nx
-import community
-from .utils import utils
+from .utils import cnm, metrics, utils
 
-def run_community_dect_alg1(network, pos, network_name, partition_reference, outputdir):
+algorithm_name = 'Clauset-Newman-Moore'
+
+def detect(network):
     """
     Finds communities in a graph using the Clauset-Newman-Moore greedy modularity maximization method
 
-    networkx greedy_modularity_communities method.
+    Returns the community of each node (in Pajek id order) and the modularity.
     """
-    
-    algorithm_name = 'Clauset-Newman-Moore'
-    print(f'Starting greedy_modularity_communities for {network_name}')
-
     nodes_index = {}
 
-    for node_name, node in network.node.items(): 
+    for node_name, node in network.nodes.items(): 
         nodes_index[node_name] = int(node['id'])-1
 
-    com_grouped = nx.algorithms.community.greedy_modularity_communities(network)
-    com_linear = [None] * len(network)
+    nodelist = sorted(nodes_index, key=nodes_index.get)
 
-    com_dict = {}
+    return detect_native(metrics.adjacency(network, nodelist))
 
-    idx_community = 0
-    for comm in com_grouped:
-        for node in comm:
-            com_dict[node] = idx_community
-            com_linear[nodes_index[node]] = idx_community
-        idx_community = idx_community + 1
+def detect_native(matrix):
+    """
+    Finds communities in a graph with the heap based implementation of utils.cnm.
+
+    Takes the sparse adjacency (LazyNetwork 'csr', rows in Pajek id order) and returns the
+    community of each node (as detect) and the modularity.
+    """
+    com_linear, _ = cnm.greedy_modularity(matrix)
+    modularity = metrics.modularity(matrix, com_linear)
+
+    return com_linear.tolist(), modularity
+
+def run_community_dect_alg1(network, pos, network_name, partition_reference, outputdir):
+    """
+    Finds the Clauset-Newman-Moore communities of a graph and saves their image and .clu file.
+    """
+    print(f'Starting greedy_modularity_communities for {network_name}')
 
-    modularity = community.modularity(com_dict, network)
+    com_linear, modularity = detect(network)
 
     danon, nvi, ji = utils.saveGraphImage(partition_reference, com_linear, modularity, network, pos, network_name, algorithm_name, outputdir)
 
@@ -1,21 +1,20 @@
-import community
 import networkx as nx
 
-from .utils import utils
+from .utils import louvain, metrics, utils
 
-def run_community_dect_alg2(network, pos, network_name, partition_reference, outputdir):
+algorithm_name = 'Louvain'
+
+def detect(network):
     """
     Finds communities in a graph using the Louvain Community Detection method
 
-    community best_partition method.
+    community best_partition method. Returns the community of each node (in Pajek id order)
+    and the modularity.
     """
-    
-    algorithm_name = 'Louvain'
-    print(f'Starting best_partition(Louvain) for {network_name}')
-
+    import community #python-louvain, not needed by detect_native
     nodes_index = {}
 
-    for node_name, node in network.node.items(): 
+    for node_name, node in network.nodes.items(): 
         nodes_index[node_name] = int(node['id'])-1
 
     dict_communities = community.best_partition(network)
@@ -25,7 +24,31 @@ def run_community_dect_alg2(network, pos, network_name, partition_reference, out
     for n_id in nodes_index:
         com_linear[nodes_index[n_id]] = dict_communities[n_id]
 
-    modularity = community.modularity(dict_communities, network)
+    nodelist = sorted(nodes_index, key=nodes_index.get)
+    modularity = metrics.modularity(metrics.adjacency(network, nodelist), com_linear)
+
+    return com_linear, modularity
+
+def detect_native(matrix, seed=None, resolution=1.0):
+    """
+    Finds communities in a graph with the vectorized Louvain implementation of utils.louvain,
+    for networks too big for best_partition.
+
+    Takes the sparse adjacency (LazyNetwork 'csr', rows in Pajek id order) and returns the
+    community of each node (as detect) and the modularity.
+    """
+    com_linear = louvain.louvain(matrix, resolution=resolution, seed=seed)
+    modularity = metrics.modularity(matrix, com_linear, resolution)
+
+    return com_linear.tolist(), modularity
+
+def run_community_dect_alg2(network, pos, network_name, partition_reference, outputdir):
+    """
+    Finds the Louvain communities of a graph and saves their image and .clu file.
+    """
+    print(f'Starting best_partition(Louvain) for {network_name}')
+
+    com_linear, modularity = detect(network)
 
     danon, nvi, ji = utils.saveGraphImage(partition_reference, com_linear, modularity, network, pos, network_name, algorithm_name, outputdir)
 
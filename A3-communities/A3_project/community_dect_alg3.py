@@ -4,21 +4,30 @@ import matplotlib as plt
 
 from .utils import utils
 
-def run_community_dect_alg3(network, network_ig, layout, network_name, partition_reference, outputdir):
+algorithm_name = 'Infomap'
+
+def detect(network_ig):
     """
     Finds communities in a graph using the Infomap method of Martin Rosvall and Carl T. Bergstrom.
 
+    Returns the community of each node and the modularity.
+    """
+    c = network_ig.community_infomap(edge_weights=network_ig.es['weight'] if network_ig.is_weighted() else None)
+
+    return c.membership, c.modularity
+
+def run_community_dect_alg3(network, network_ig, layout, network_name, partition_reference, outputdir):
+    """
+    Finds the Infomap communities of a graph and saves their image and .clu file.
     """
-    
-    algorithm_name = 'Infomap'
     print(f'Starting community_infomap(M. Rosvall...) for {network_name}')
 
-    c = network_ig.community_infomap(edge_weights=network_ig.es['weight'] if network_ig.is_weighted() else None)
+    membership, modularity = detect(network_ig)
 
-    danon, nvi, ji = utils.saveGraphImage(partition_reference, c.membership, c.modularity, network, layout, network_name, algorithm_name, outputdir)
+    danon, nvi, ji = utils.saveGraphImage(partition_reference, membership, modularity, network, layout, network_name, algorithm_name, outputdir)
 
     #utils.saveGraphImageIgraph(partition_reference, c, c.membership, network, layout, network_name, algorithm_name, outputdir)
 
-    utils.saveCluster(c.membership, algorithm_name, network_name, outputdir)
+    utils.saveCluster(membership, algorithm_name, network_name, outputdir)
 
-    return c.modularity, danon, nvi, ji
\ No newline at end of file
+    return modularity, danon, nvi, ji
\ No newline at end of file
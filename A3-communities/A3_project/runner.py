@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError: #Not available on Windows
+    resource = None
+
+from . import community_dect_alg1, community_dect_alg2, community_dect_alg3
+from .utils import utils
+
+#Algorithm name -> (detect function, network view it takes: 'network' (networkx), 'network_igraph' or 'csr')
+algorithms = {
+    community_dect_alg1.algorithm_name: (community_dect_alg1.detect_native, 'csr'),
+    community_dect_alg2.algorithm_name: (community_dect_alg2.detect, 'network'),
+    community_dect_alg3.algorithm_name: (community_dect_alg3.detect, 'network_igraph'),
+}
+
+def use_native_louvain(seed=None, resolution=1.0):
+    """ Replaces community.best_partition by the vectorized Louvain of utils.louvain. """
+    algorithms[community_dect_alg2.algorithm_name] = (partial(community_dect_alg2.detect_native, seed=seed, resolution=resolution), 'csr')
+
+def _detect_job(conn, detect, network, view, memory_limit_mb):
+    #Runs in its own process: the result or the error goes back through the pipe
+    if memory_limit_mb is not None and resource is not None:
+        limit = int(memory_limit_mb * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    start = time.perf_counter()
+    try:
+        membership, modularity = detect(network[view]) #the view is built here, inside the limits
+        conn.send({'membership': [int(c) for c in membership], 'modularity': float(modularity),
+                   'time': time.perf_counter() - start, 'error': None})
+    except MemoryError:
+        conn.send({'error': f'memory limit of {memory_limit_mb} MB exceeded', 'time': time.perf_counter() - start})
+    except Exception as e:
+        conn.send({'error': f'{type(e).__name__}: {e}', 'time': time.perf_counter() - start})
+    finally:
+        conn.close()
+
+def detect_all(networks, algorithm_names=None, workers=None, timeout=None, memory_limit_mb=None):
+    """ Runs every (network, algorithm) job, each one in its own process, at most `workers`
+    at the same time, and returns a dict (network index, algorithm name) -> result.
+
+    A result has the membership (in Pajek id order), modularity and time of the job, or an
+    error message when the job failed, took more than `timeout` seconds (it is killed) or
+    tried to allocate more than `memory_limit_mb`.
+
+    Keyword arguments:
+    networks -- networks as returned by utils.readNetworks
+    algorithm_names -- names in `algorithms` to run (default all of them)
+    workers -- maximum number of jobs running at the same time (default number of cores)
+    timeout -- seconds per job (default None, no limit)
+    memory_limit_mb -- address space limit per job, only on Unix (default None, no limit)
+    """
+    algorithm_names = list(algorithms) if algorithm_names is None else algorithm_names
+    workers = workers or os.cpu_count() or 1
+
+    #Biggest networks first so the slowest jobs do not start last
+    order = sorted(range(len(networks)), key=lambda i: -networks[i].number_of_edges())
+    pending = [(i, name) for i in order for name in algorithm_names]
+    running = {} #conn -> (job, process, start time)
+    results = {}
+
+    while pending or running:
+        while pending and len(running) < workers:
+            job = pending.pop(0)
+            detect, view = algorithms[job[1]]
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_detect_job, args=(sender, detect, networks[job[0]], view, memory_limit_mb))
+            process.start()
+            sender.close()
+            running[receiver] = (job, process, time.perf_counter())
+            print(f'Started {job[1]} for {networks[job[0]]["network_name"]}')
+
+        ready = wait(list(running), timeout=1.0)
+
+        for conn in list(running):
+            job, process, start = running[conn]
+            result = None
+
+            if conn in ready:
+                try:
+                    result = conn.recv()
+                except EOFError: #The process died without answering (e.g. killed by the OOM killer)
+                    process.join()
+                    result = {'error': f'process exited with code {process.exitcode}', 'time': time.perf_counter() - start}
+            elif timeout is not None and time.perf_counter() - start > timeout:
+                process.terminate()
+                result = {'error': f'timeout after {timeout} s', 'time': time.perf_counter() - start}
+
+            if result is not None:
+                process.join()
+                conn.close()
+                del running[conn]
+                results[job] = result
+
+                status = result['error'] or f'modularity {result["modularity"]:.4f}'
+                print(f'Finished {job[1]} for {networks[job[0]]["network_name"]} in {result["time"]:.1f} s - {status}')
+
+    return results
+
+_networks = None
+
+def _init_worker(networks):
+    global _networks
+    _networks = networks
+
+def _save_job(task):
+    i, algorithm_name, membership, modularity, outputdir = task
+    network = _networks[i]
+
+    danon, nvi, ji = utils.saveGraphImage(network['partition_reference'], membership, modularity, network['network'],
+                                          network['pos'], network['network_name'], algorithm_name, outputdir)
+    utils.saveCluster(membership, algorithm_name, network['network_name'], outputdir)
+
+    return danon, nvi, ji
+
+def _save_reference(task):
+    i, outputdir = task
+    network = _networks[i]
+    utils.saveGraphImageReference(network['network'], network['pos'], network['network_name'], network['partition_reference'], outputdir)
+
+def save_all(networks, results, outputdir, workers=None):
+    """ Writes the images and .clu files of the results (in parallel) and the reference images,
+    and sets network['metrics'][algorithm] = (modularity, danon, nvi, ji) as utils.saveMetrics
+    expects (all None for the failed jobs).
+
+    Keyword arguments:
+    networks -- networks as returned by utils.readNetworks
+    results -- results of detect_all
+    outputdir -- output folder
+    workers -- number of processes (default number of cores)
+    """
+    for network in networks:
+        network['metrics'] = {}
+
+    jobs = [job for job, result in results.items() if result['error'] is None]
+    for job, result in results.items():
+        if result['error'] is not None:
+            networks[job[0]]['metrics'][job[1]] = (None, None, None, None)
+
+    references = [(i, outputdir) for i, network in enumerate(networks) if network['partition_reference'] != None]
+
+    #The layout of each network is computed (or loaded from the cache) once, here, and
+    #reaches the workers with the networks
+    for i in sorted({i for i, _ in jobs} | {i for i, _ in references}):
+        networks[i]['pos']
+
+    tasks = [(i, name, results[(i, name)]['membership'], results[(i, name)]['modularity'], outputdir) for i, name in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(networks,)) as executor:
+        for (i, name), comparison in zip(jobs, executor.map(_save_job, tasks)):
+            networks[i]['metrics'][name] = (results[(i, name)]['modularity'],) + tuple(comparison)
+
+        list(executor.map(_save_reference, references))
@@ -0,0 +1,137 @@
+import heapq
+
+import numpy as np
+import scipy.sparse as sp
+
+def _merge_rows(nbr_a, e_a, nbr_b, e_b):
+    #Union of two sorted sparse rows, adding the values of the common neighbours
+    nbr = np.concatenate((nbr_a, nbr_b))
+    e = np.concatenate((e_a, e_b))
+    if len(nbr) == 0:
+        return nbr, e
+
+    order = np.argsort(nbr, kind='stable')
+    nbr, e = nbr[order], e[order]
+
+    starts = np.flatnonzero(np.concatenate(([True], nbr[1:] != nbr[:-1])))
+    return nbr[starts], np.add.reduceat(e, starts)
+
+def merges(matrix):
+    """ Clauset-Newman-Moore greedy modularity maximization, streamed: yields one
+    (kept, removed, ΔQ, Q) tuple per merge, community `removed` joining `kept`, until no
+    two communities are linked (also past the maximum of Q, so the dendrogram can be cut at
+    any level, see cut()).
+
+    Each community keeps its sorted row of neighbours and e_ij (fraction of edge ends between
+    i and j); ΔQ_ij = 2(e_ij - a_i·a_j) is kept in one max-heap with lazy deletion (entries
+    of communities changed since they were pushed are skipped). The smaller row is always
+    merged into the bigger one.
+
+    Keyword arguments:
+    matrix -- symmetric scipy CSR adjacency, self-loops counted twice (see metrics.adjacency)
+    """
+    matrix = sp.csr_matrix(matrix, dtype=float)
+    n = matrix.shape[0]
+    m2 = matrix.sum()
+    if m2 == 0:
+        return
+
+    degree = np.asarray(matrix.sum(axis=1)).ravel()
+    a = (degree / m2).tolist()
+    q = float(np.sum(matrix.diagonal() / m2) - np.dot(degree / m2, degree / m2))
+
+    nbr = []
+    e = []
+    for i in range(n):
+        start, end = matrix.indptr[i], matrix.indptr[i + 1]
+        cols = matrix.indices[start:end]
+        not_self = cols != i
+        order = np.argsort(cols[not_self])
+        nbr.append(cols[not_self][order])
+        e.append(matrix.data[start:end][not_self][order] / m2)
+
+    version = [0] * n
+    alive = [True] * n
+
+    heap = [(-2 * (e_ij - a[i] * a[j]), i, j, 0, 0)
+            for i in range(n) for j, e_ij in zip(nbr[i].tolist(), e[i].tolist()) if i < j]
+    heapq.heapify(heap)
+
+    while heap:
+        neg_dq, i, j, version_i, version_j = heapq.heappop(heap)
+        if not (alive[i] and alive[j] and version[i] == version_i and version[j] == version_j):
+            continue
+
+        if len(nbr[i]) < len(nbr[j]):
+            i, j = j, i
+        dq = -neg_dq
+        q += dq
+
+        #Neighbours of j now link to i
+        for k, e_kj in zip(nbr[j].tolist(), e[j].tolist()):
+            if k == i:
+                continue
+            row = nbr[k]
+            pos_j = np.searchsorted(row, j)
+            pos_i = np.searchsorted(row, i)
+            if pos_i < len(row) and row[pos_i] == i:
+                e[k][pos_i] += e_kj
+                nbr[k] = np.delete(row, pos_j)
+                e[k] = np.delete(e[k], pos_j)
+            else:
+                #Replace j by i, keeping the row sorted
+                row = np.delete(row, pos_j)
+                values = np.delete(e[k], pos_j)
+                pos_i = np.searchsorted(row, i)
+                nbr[k] = np.insert(row, pos_i, i)
+                e[k] = np.insert(values, pos_i, e_kj)
+
+        nbr[i], e[i] = _merge_rows(nbr[i], e[i], nbr[j], e[j])
+        keep = (nbr[i] != i) & (nbr[i] != j)
+        nbr[i], e[i] = nbr[i][keep], e[i][keep]
+
+        a[i] += a[j]
+        alive[j] = False
+        nbr[j] = e[j] = None
+        version[i] += 1
+
+        for k, e_ik in zip(nbr[i].tolist(), e[i].tolist()):
+            low, high = (i, k) if i < k else (k, i)
+            heapq.heappush(heap, (-2 * (e_ik - a[i] * a[k]), low, high, version[low], version[high]))
+
+        yield i, j, dq, q
+
+def cut(n, merge_list, steps):
+    """ Returns the membership (labels 0..k-1) after the first `steps` merges of a dendrogram.
+
+    Keyword arguments:
+    n -- number of nodes
+    merge_list -- (kept, removed, ...) tuples, as yielded by merges()
+    steps -- number of merges to apply (n - steps communities, if there are enough merges)
+    """
+    parent = np.arange(n)
+    for kept, removed, *_ in merge_list[:steps]:
+        parent[removed] = kept
+
+    #Follow the parents up to the roots (a removed community is never used again)
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            break
+        parent = grandparent
+
+    return np.unique(parent, return_inverse=True)[1].ravel()
+
+def greedy_modularity(matrix):
+    """ Returns the CNM partition of maximum modularity (labels 0..k-1) and the whole list of
+    merges, which can be cut at other levels with cut(). """
+    merge_list = list(merges(matrix))
+    n = matrix.shape[0]
+
+    if not merge_list:
+        return np.arange(n), merge_list
+
+    #Q after 0, 1, 2... merges
+    qs = [merge_list[0][3] - merge_list[0][2]] + [q for *_, q in merge_list]
+
+    return cut(n, merge_list, int(np.argmax(qs))), merge_list
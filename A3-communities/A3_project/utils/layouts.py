@@ -0,0 +1,92 @@
+import hashlib
+import os
+
+import igraph as ig
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import eigsh
+
+#Above this number of nodes 'auto' uses the spectral layout instead of Kamada-Kawai (O(N²))
+AUTO_MAX_KK_NODES = 2000
+
+def graphHash(n, edges):
+    """ Returns a hash of the structure of a graph (number of nodes and edge set, ignoring
+    direction, multiplicity and weights), so the same graph gets the same layout whatever
+    file it is read from.
+
+    Keyword arguments:
+    n -- number of nodes
+    edges -- (m x 2) array of 0-based node indices
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    keys = np.unique(edges.min(axis=1) * n + edges.max(axis=1))
+
+    digest = hashlib.sha1(np.int64(n).tobytes())
+    digest.update(keys.tobytes())
+
+    return digest.hexdigest()
+
+def spectralLayout(n, edges):
+    """ Returns (n x 2) coordinates from the 2nd and 3rd eigenvectors of the random walk
+    matrix D^-1 A, computed with a sparse eigensolver (O(m) per iteration). """
+    if n < 3:
+        return np.column_stack((np.arange(n, dtype=float), np.zeros(n)))
+
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    adjacency = sp.coo_matrix((np.ones(len(edges)), (edges[:, 0], edges[:, 1])), shape=(n, n)).tocsr()
+    adjacency = ((adjacency + adjacency.T) > 0).astype(float)
+
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    degree[degree == 0] = 1
+    inv_sqrt = sp.diags(1 / np.sqrt(degree))
+
+    #Largest eigenvalues of I + D^-1/2 A D^-1/2 (all >= 0, so 'LA' converges fast), with the
+    #low precision a drawing needs
+    normalized = sp.identity(n) + inv_sqrt @ adjacency @ inv_sqrt
+    values, vectors = eigsh(normalized, k=3, which='LA', v0=np.sqrt(degree), tol=1e-4)
+    vectors = vectors[:, np.argsort(-values)][:, 1:3] / np.sqrt(degree)[:, None]
+
+    return vectors / np.abs(vectors).max(axis=0).clip(min=1e-12)
+
+def kamadaKawaiLayout(n, edges):
+    """ Returns (n x 2) Kamada-Kawai coordinates (igraph implementation). """
+    return np.array(ig.Graph(n=n, edges=np.asarray(edges).tolist()).layout('kk').coords, dtype=float).reshape(-1, 2)
+
+algorithms = {
+    'kk': kamadaKawaiLayout,
+    'spectral': spectralLayout,
+}
+
+def computeLayout(n, edges, algorithm='auto', cachedir='A3_project/output/layouts'):
+    """ Returns (n x 2) node coordinates, from the on-disk cache when this graph was already
+    laid out with this algorithm (cachedir/<graph hash>-<algorithm>.npy).
+
+    Keyword arguments:
+    n -- number of nodes
+    edges -- (m x 2) array of 0-based node indices
+    algorithm -- 'kk', 'spectral' or 'auto' (kk up to AUTO_MAX_KK_NODES nodes) (default 'auto')
+    cachedir -- cache folder, None to disable the cache (default A3_project/output/layouts)
+    """
+    if algorithm == 'auto':
+        algorithm = 'kk' if n <= AUTO_MAX_KK_NODES else 'spectral'
+    if algorithm not in algorithms:
+        raise Exception(f'Unknown layout {algorithm}. Valid layouts: {list(algorithms)} or auto')
+
+    cache_file = None
+    if cachedir is not None:
+        cache_file = os.path.join(cachedir, f'{graphHash(n, edges)}-{algorithm}.npy')
+        if os.path.exists(cache_file):
+            return np.load(cache_file)
+
+    coords = algorithms[algorithm](n, edges)
+
+    if cache_file is not None:
+        if not os.path.exists(cachedir):
+            os.makedirs(cachedir, exist_ok=True)
+        #Written aside and renamed, so parallel jobs never read half a file
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            np.save(f, coords)
+        os.replace(tmp_file, cache_file)
+
+    return coords
@@ -0,0 +1,135 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+def _relabel(membership):
+    #Labels -> 0..k-1, keeping their order
+    return np.unique(membership, return_inverse=True)[1].ravel()
+
+def _indicator(membership, n_communities):
+    return sp.csr_matrix((np.ones(len(membership)), (np.arange(len(membership)), membership)),
+                         shape=(len(membership), n_communities))
+
+def _modularity(matrix, rows, membership, degree, m2, resolution):
+    same = membership[rows] == membership[matrix.indices]
+    volume = np.bincount(membership, weights=degree)
+    return (matrix.data[same].sum() - resolution * np.dot(volume, volume) / m2) / m2
+
+def _move_nodes(matrix, resolution, rng, tol, max_rounds):
+    """ Local moving phase, vectorized: in each round every node computes the gain of moving
+    to each neighbouring community from one sparse product A·M and a random half of the
+    nodes that can improve move at the same time. Rounds that do not increase the modularity
+    are undone and retried moving fewer nodes (down to a single one). Returns the membership. """
+    n = matrix.shape[0]
+    degree = np.asarray(matrix.sum(axis=1)).ravel()
+    m2 = degree.sum()
+    self_loops = matrix.diagonal()
+    matrix_rows = np.repeat(np.arange(n), np.diff(matrix.indptr))
+
+    membership = np.arange(n)
+    total = degree.copy() #Σtot of each community (indexed by label)
+    if m2 == 0:
+        return membership
+    quality = _modularity(matrix, matrix_rows, membership, degree, m2, resolution)
+    move_prob = 0.5
+
+    for _ in range(max_rounds):
+        #k_ic: weight from node i to community c (without its self-loop), one row per node
+        links = (matrix @ _indicator(membership, n)).tocsr()
+        rows = np.repeat(np.arange(n), np.diff(links.indptr))
+        communities = links.indices
+        own = communities == membership[rows]
+        k_ic = links.data - np.where(own, self_loops[rows], 0.0)
+
+        #score(c) = k_ic - γ·k_i·Σtot'_c/2m, Σtot' without node i itself
+        total_c = total[communities] - np.where(own, degree[rows], 0.0)
+        score = k_ic - resolution * degree[rows] * total_c / m2
+
+        #Staying in its own community, also when it has no neighbours there
+        own_score = -resolution * degree * (total[membership] - degree) / m2
+        own_score[rows[own]] = score[own]
+
+        #Best community of each node: first entry of its row with the maximum score
+        nonempty = np.diff(links.indptr) > 0
+        row_max = np.full(n, -np.inf)
+        row_max[nonempty] = np.maximum.reduceat(score, links.indptr[:-1][nonempty])
+        best = np.flatnonzero(score >= row_max[rows])
+        best = best[np.concatenate(([True], rows[best][1:] != rows[best][:-1]))]
+        best_rows = rows[best]
+
+        improves = score[best] > own_score[best_rows] + tol
+        candidates = best_rows[improves]
+        if len(candidates) == 0:
+            break
+
+        target = np.empty(n, dtype=np.int64)
+        target[candidates] = communities[best[improves]]
+
+        while True:
+            moving = candidates[rng.random(len(candidates)) < move_prob]
+            if len(moving) == 0:
+                moving = rng.choice(candidates, 1)
+            new_membership = membership.copy()
+            new_membership[moving] = target[moving]
+            new_quality = _modularity(matrix, matrix_rows, new_membership, degree, m2, resolution)
+
+            #A single move always gains what its score says
+            if new_quality > quality + tol or len(moving) == 1:
+                break
+            move_prob /= 2
+
+        if new_quality <= quality + tol:
+            break
+
+        membership = new_membership
+        quality = new_quality
+        total = np.bincount(membership, weights=degree, minlength=n)
+        move_prob = min(2 * move_prob, 0.5)
+
+    return _relabel(membership)
+
+def _split_disconnected(matrix, membership):
+    """ Splits every community into its connected components (always increases the modularity). """
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    same = membership[rows] == membership[matrix.indices]
+    inside = sp.csr_matrix((np.ones(np.count_nonzero(same)), (rows[same], matrix.indices[same])), shape=matrix.shape)
+
+    _, components = connected_components(inside, directed=False)
+    return components
+
+def louvain(matrix, resolution=1.0, seed=None, refine=True, tol=1e-10, max_rounds=1000, max_levels=100):
+    """ Louvain community detection on a sparse adjacency matrix. Returns the community of
+    each row (labels 0..k-1).
+
+    Each level runs the vectorized local moving phase and aggregates the communities into
+    the nodes of the next level (Aᶜ = Mᵀ A M), until a level does not merge anything.
+
+    Keyword arguments:
+    matrix -- symmetric scipy CSR adjacency, self-loops counted twice (see metrics.adjacency)
+    resolution -- resolution parameter γ of the modularity (default 1.0)
+    seed -- seed of the random generator (default None)
+    refine -- split the communities that are not connected after each level, as Leiden
+              guarantees (default True)
+    tol -- minimum modularity gain (default 1e-10)
+    max_rounds -- maximum rounds of the local moving phase of a level (default 1000)
+    max_levels -- maximum number of levels (default 100)
+    """
+    rng = np.random.default_rng(seed)
+    matrix = sp.csr_matrix(matrix, dtype=float)
+    membership = np.arange(matrix.shape[0])
+    level = matrix
+
+    for _ in range(max_levels):
+        level_membership = _move_nodes(level, resolution, rng, tol, max_rounds)
+        if refine:
+            level_membership = _split_disconnected(level, level_membership)
+
+        n_communities = level_membership.max() + 1 if len(level_membership) > 0 else 0
+        if n_communities == level.shape[0]:
+            break
+
+        membership = level_membership[membership]
+        indicator = _indicator(level_membership, n_communities)
+        level = (indicator.T @ level @ indicator).tocsr()
+
+    return membership
@@ -0,0 +1,135 @@
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+
+def adjacency(network, nodelist=None, weight='weight'):
+    """ Returns the symmetric CSR adjacency of a networkx graph, self-loops counted twice in
+    the diagonal (so row sums are the degrees, as graph.degree(weight) reports them).
+
+    Keyword arguments:
+    network -- networkx graph
+    nodelist -- order of the rows (default network.nodes())
+    weight -- edge attribute with the weight (default 'weight', 1 when missing)
+    """
+    #to_scipy_sparse_matrix was renamed in networkx 2.7
+    to_sparse = getattr(nx, 'to_scipy_sparse_array', None) or nx.to_scipy_sparse_matrix
+    matrix = sp.csr_matrix(to_sparse(network, nodelist=nodelist, weight=weight, dtype=float))
+
+    return (matrix + sp.diags(matrix.diagonal())).tocsr()
+
+def _internal(matrix, membership):
+    #Weight of the edges inside each community (both directions) and volume of each community
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    same = membership[rows] == membership[matrix.indices]
+    n_communities = membership.max() + 1 if len(membership) > 0 else 0
+
+    internal = np.bincount(membership[rows[same]], weights=matrix.data[same], minlength=n_communities)
+    volume = np.bincount(membership, weights=np.asarray(matrix.sum(axis=1)).ravel(), minlength=n_communities)
+
+    return internal, volume
+
+def _membership(membership):
+    #Any labels -> 0..k-1
+    return np.unique(np.asarray(membership), return_inverse=True)[1].ravel()
+
+def modularity(matrix, membership, resolution=1.0):
+    """ Newman's modularity of a partition.
+
+    Keyword arguments:
+    matrix -- symmetric scipy CSR adjacency (see adjacency())
+    membership -- community of each row
+    resolution -- resolution parameter γ of Q = Σc [in_c/2m - γ(vol_c/2m)²] (default 1.0)
+    """
+    membership = _membership(membership)
+    internal, volume = _internal(matrix, membership)
+    m2 = volume.sum()
+
+    if m2 == 0:
+        return 0.0
+
+    return float((internal.sum() - resolution * np.dot(volume, volume) / m2) / m2)
+
+def coverage(matrix, membership):
+    """ Fraction of the edge weight inside communities. """
+    membership = _membership(membership)
+    internal, volume = _internal(matrix, membership)
+
+    return float(internal.sum() / volume.sum()) if volume.sum() > 0 else 0.0
+
+def performance(matrix, membership):
+    """ Fraction of node pairs correctly classified: linked pairs inside a community plus
+    unlinked pairs in different communities (weights and self-loops are ignored). """
+    membership = _membership(membership)
+    n = len(membership)
+    if n < 2:
+        return 1.0
+
+    linked = sp.triu(matrix, k=1).tocoo()
+    same = membership[linked.row] == membership[linked.col]
+    sizes = np.bincount(membership).astype(float)
+
+    intra_edges = np.count_nonzero(same)
+    inter_edges = len(same) - intra_edges
+    pairs = n * (n - 1) / 2
+    inter_pairs = pairs - np.sum(sizes * (sizes - 1) / 2)
+
+    return float((intra_edges + inter_pairs - inter_edges) / pairs)
+
+def conductance(matrix, membership):
+    """ Returns the conductance of each community: cut / min(vol_c, 2m - vol_c). """
+    membership = _membership(membership)
+    internal, volume = _internal(matrix, membership)
+    denominator = np.minimum(volume, volume.sum() - volume)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, (volume - internal) / denominator, 0.0)
+
+def quality(matrix, membership):
+    """ Returns modularity, coverage, performance and mean conductance of a partition. """
+    return {
+        'modularity': modularity(matrix, membership),
+        'coverage': coverage(matrix, membership),
+        'performance': performance(matrix, membership),
+        'conductance': float(np.mean(conductance(matrix, membership))),
+    }
+
+def contingency(partition_a, partition_b):
+    """ Returns the contingency table n_ij = |a_i ∩ b_j| of two partitions as a sparse matrix. """
+    a = _membership(partition_a)
+    b = _membership(partition_b)
+    if len(a) != len(b):
+        raise Exception('The partitions have a different number of nodes')
+
+    return sp.coo_matrix((np.ones(len(a)), (a, b)), shape=(a.max() + 1, b.max() + 1)).tocsr()
+
+def compare(partition_a, partition_b):
+    """ Compares two partitions from their contingency table and returns (NMI, VI, Jaccard).
+
+    NMI = 2I(a,b)/(H(a)+H(b)) (Danon et al.), VI = H(a)+H(b)-2I(a,b) in nats and Jaccard is
+    the pair counting index: pairs together in both partitions / pairs together in any of them.
+
+    Keyword arguments:
+    partition_a -- community of each node
+    partition_b -- community of each node
+    """
+    table = contingency(partition_a, partition_b)
+    n = table.sum()
+    n_ij = table.data
+    a = np.asarray(table.sum(axis=1)).ravel()
+    b = np.asarray(table.sum(axis=0)).ravel()
+    rows = np.repeat(np.arange(table.shape[0]), np.diff(table.indptr))
+
+    h_a = -np.sum(a / n * np.log(a / n))
+    h_b = -np.sum(b / n * np.log(b / n))
+    mutual = np.sum(n_ij / n * np.log(n_ij * n / (a[rows] * b[table.indices])))
+
+    nmi = 2 * mutual / (h_a + h_b) if h_a + h_b > 0 else 1.0
+    vi = h_a + h_b - 2 * mutual
+    vi = vi if vi > 0 else 0.0 #rounding
+
+    together_both = np.sum(n_ij * (n_ij - 1) / 2)
+    together_any = np.sum(a * (a - 1) / 2) + np.sum(b * (b - 1) / 2) - together_both
+    jaccard = together_both / together_any if together_any > 0 else 1.0
+
+    return float(nmi), float(vi), float(jaccard)
@@ -1,14 +1,20 @@
 import fnmatch
 import math
 import os
+import sys
 from pathlib import Path
 
 import numpy as np
-import community
+import scipy.sparse as sp
 import igraph as ig
 import matplotlib.pyplot as plt
 import networkx as nx
-from sklearn import metrics
+
+from . import layouts, metrics
+
+#pajek.py is shared with A4-dynamics, in the common folder at the root of the repository
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from common.pajek import read_pajek
 
 
 def getReferencePartition(netFileName, numberOfNodes, rootFolder):
@@ -45,65 +51,129 @@ def getReferencePartition(netFileName, numberOfNodes, rootFolder):
 
 
 
-def readNetworks(path='A3_project/networks'):
+class LazyNetwork(dict):
+    """ Network read from a Pajek file, as the dict readNetworks used to return.
+
+    Only the parsed arrays (labels, edges, weights, coords, directed) are kept; the views
+    'network' (networkx Graph, as nx.Graph(nx.read_pajek(...))), 'network_igraph' (igraph
+    Graph, as ig.read(...)), 'csr' (scipy adjacency of 'network', as metrics.adjacency),
+    'pos' (networkx positions) and 'layout' (igraph layout) are built the first time they
+    are asked for. 'pos' and 'layout' are the same coordinates:
+    the ones of the file or else one layout computed (and cached) with layouts.computeLayout.
+    """
+
+    def __init__(self, parsed, network_name, partition_reference, layout_algorithm='auto', layout_cachedir='A3_project/output/layouts'):
+        super().__init__(network_name=network_name, partition_reference=partition_reference)
+        self.layout_algorithm = layout_algorithm
+        self.layout_cachedir = layout_cachedir
+        self.labels = parsed['labels']
+        self.edges = parsed['edges']
+        self.weights = parsed['weights']
+        self.coords = parsed['coords']
+        self.directed = parsed['directed']
+
+    def number_of_nodes(self):
+        return len(self.labels)
+
+    def number_of_edges(self):
+        return len(self.edges)
+
+    def __missing__(self, key):
+        if key == 'network':
+            value = self._networkx()
+        elif key == 'network_igraph':
+            value = self._igraph()
+        elif key == 'csr':
+            value = self._csr()
+        elif key in ('pos', 'layout'):
+            self._layouts()
+            return self[key]
+        else:
+            raise KeyError(key)
+
+        self[key] = value
+        return value
+
+    def _networkx(self):
+        net = nx.Graph()
+        for i, label in enumerate(self.labels):
+            attributes = {'id': str(i + 1)}
+            if self.coords is not None:
+                attributes.update(x=float(self.coords[i, 0]), y=float(self.coords[i, 1]))
+            net.add_node(label, **attributes)
+
+        src = [self.labels[i] for i in self.edges[:, 0]]
+        dst = [self.labels[i] for i in self.edges[:, 1]]
+        if self.weights is not None:
+            net.add_weighted_edges_from(zip(src, dst, self.weights.tolist()))
+        else:
+            net.add_edges_from(zip(src, dst))
+
+        return net
+
+    def _igraph(self):
+        net_igraph = ig.Graph(n=len(self.labels), edges=self.edges.tolist(), directed=self.directed)
+        net_igraph.vs['id'] = self.labels #ig.read used 'id' for the labels, newer versions use 'name'
+        net_igraph.vs['name'] = self.labels
+        if self.coords is not None:
+            net_igraph.vs['x'] = self.coords[:, 0].tolist()
+            net_igraph.vs['y'] = self.coords[:, 1].tolist()
+        if self.weights is not None:
+            net_igraph.es['weight'] = self.weights.tolist()
+
+        return net_igraph
+
+    def _csr(self):
+        n = len(self.labels)
+        weights = self.weights if self.weights is not None else np.ones(len(self.edges))
+
+        #One weight per undirected edge, the last one as in nx.Graph
+        keys = self.edges.min(axis=1) * n + self.edges.max(axis=1)
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - last
+        src, dst, weights = self.edges[last, 0], self.edges[last, 1], weights[last]
+
+        #Both directions, self-loops twice
+        matrix = sp.coo_matrix((np.concatenate((weights, weights)), (np.concatenate((src, dst)), np.concatenate((dst, src)))),
+                               shape=(n, n))
+        return matrix.tocsr()
+
+    def _layouts(self):
+        print(f'Started getting coordinates for {self["network_name"]}')
+        if self.coords is not None:
+            coords = self.coords
+            print('Got coordinates from the file.')
+        else:
+            coords = layouts.computeLayout(len(self.labels), self.edges, self.layout_algorithm, self.layout_cachedir)
+
+        #Pajek/igraph y axis points down
+        self['pos'] = dict(zip(self.labels, np.column_stack((coords[:, 0], -coords[:, 1]))))
+        self['layout'] = [tuple(xy) for xy in coords.tolist()]
+        print(f'Finished getting coordinates for {self["network_name"]}')
+
+def readNetworks(path='A3_project/networks', cache=True, layout='auto'):
     """ Returns all networks and their partition references for a given path.
 
+    Each file is parsed once (see common/pajek.py read_pajek); the networkx and igraph graphs and the node
+    positions are only built when they are used (see LazyNetwork).
+
     Keyword arguments:
     path -- Path that will be searched for .net files (default A3_project/networks)
+    cache -- read/write the binary cache of the parsed files (default True)
+    layout -- layout of the networks without coordinates: 'kk', 'spectral' or 'auto' (default 'auto')
     """ 
 
     networks = []
-    pajek = None
-    netname = None
-    net = None
-    partition_reference = None
 
     for root, _, files in os.walk(path):
         for f in fnmatch.filter(files, '*.net'):
             netname = os.path.splitext(os.path.basename(f))[0]
-            
-            #Networkx
-            pajek = nx.read_pajek(os.path.join(root, f))
-            net = nx.Graph(pajek)
-        
-            #igraph
-            net_igraph = ig.read(os.path.join(root, f))
-
-            pos = None
-            layout = None
-            
-            #Get the positions
-            #if hasattr(net_igraph.vs, 'x') and hasattr(net_igraph.vs, 'y'):
-
-            print(f'Started getting coordinates for {netname}')
-            try:
-                coord_x = net_igraph.vs['x']
-                coord_y = net_igraph.vs['y']
-
-                ids = net_igraph.vs['id']
-
-                pos = dict(zip(ids, np.asarray([[float(x), -float(y)] for x, y in zip(coord_x, coord_y)])))
-                layout = list(zip(coord_x, coord_y))
-                print('Got coordinates from the file.')
-            except:
-                pos = nx.kamada_kawai_layout(net)
-                layout = net_igraph.layout('kk')
-
-            print(f'Finished getting coordinates for {netname}')
+            parsed = read_pajek(os.path.join(root, f), cache)
 
             #Partition reference - if exists
-            partition_reference = getReferencePartition(netname, len(net), root)
-
-            network = {
-                "network": net,
-                "network_igraph": net_igraph,
-                "network_name": os.path.splitext(os.path.basename(f))[0],
-                "pos": pos,             #for networkx
-                "layout": layout,       #for Igraph
-                "partition_reference": partition_reference
-            }
-
-            networks.append(network)
+            partition_reference = getReferencePartition(netname, len(parsed['labels']), root)
+
+            networks.append(LazyNetwork(parsed, netname, partition_reference, layout))
     
     return networks
 
@@ -118,9 +188,9 @@ def saveGraphImage(partition_reference, communities, modularity, network, pos, n
     nvi = None
     ji = None
     if(partition_reference != None):
-        danon = ig.compare_communities(partition_reference, communities, method='danon')       
-        nvi = ig.compare_communities(partition_reference, communities, method='vi')/math.log(len(network))
-        ji = metrics.jaccard_similarity_score(partition_reference, communities, normalize=True)
+        #One contingency table for the three indices (ji is the pair counting Jaccard index)
+        danon, vi, ji = metrics.compare(partition_reference, communities)
+        nvi = vi/math.log(len(network))
         graph_title = graph_title + f'\nJaccard Index: {ji}\nNormalized Mutual Information: {danon}\nNormalized Variation of Information: {nvi}'
     
     directory = os.path.join(outputdir, 'images', network_name)
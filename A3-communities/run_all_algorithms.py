@@ -1,23 +1,32 @@
-from A3_project.community_dect_alg1 import run_community_dect_alg1
-from A3_project.community_dect_alg2 import run_community_dect_alg2
-from A3_project.community_dect_alg3 import run_community_dect_alg3
+from A3_project import runner
 from A3_project.utils import utils
 
 outputdir = 'A3_project/output/'
 
-networks = utils.readNetworks()
+#layout of the networks without coordinates: 'kk' (Kamada-Kawai), 'spectral' (fast, for big networks) or 'auto'
+layout = 'auto'
 
-metrics = {}
+#Louvain implementation: 'python-louvain' (community.best_partition) or 'native' (vectorized, for big networks)
+louvain = 'python-louvain'
+louvain_seed = None
 
-for network in networks:
-    metric = {}
-    metric['Clauset-Newman-Moore'] = run_community_dect_alg1(network['network'], network['pos'], network['network_name'], network['partition_reference'],outputdir)
-    metric['Louvain'] = run_community_dect_alg2(network['network'], network['pos'], network['network_name'], network['partition_reference'],outputdir)
-    metric['Infomap'] = run_community_dect_alg3(network['network'], network['network_igraph'], network['pos'], network['network_name'], network['partition_reference'],outputdir)
+#maximum number of detection jobs (network x algorithm) running at the same time (None = number of cores)
+workers = None
 
-    network['metrics'] = metric
+#seconds before a detection job is killed (None = no limit)
+timeout = None
 
-    if (network['partition_reference'] != None):
-        utils.saveGraphImageReference(network['network'], network['pos'], network['network_name'], network['partition_reference'], outputdir)
-    
-utils.saveMetrics(networks, outputdir)
\ No newline at end of file
+#address space limit of each detection job in MB (None = no limit, only on Unix)
+memory_limit_mb = None
+
+if __name__ == '__main__':
+    networks = utils.readNetworks(layout=layout)
+
+    if louvain == 'native':
+        runner.use_native_louvain(louvain_seed)
+
+    #Detection first, in parallel, then the images and .clu files of the results
+    results = runner.detect_all(networks, workers=workers, timeout=timeout, memory_limit_mb=memory_limit_mb)
+    runner.save_all(networks, results, outputdir, workers)
+
+    utils.saveMetrics(networks, outputdir)
@@ -0,0 +1,93 @@
+import numpy as np
+
+from A4_project.model.CSRGraph import CSRGraph
+from A4_project.model.stationarity import StationarityMonitor
+
+class BatchSIS():
+    """ SIS model advancing all the Monte Carlo repetitions at once.
+
+    The status of every replica is a row of an (n_rep x N) boolean matrix, so one
+    time step for all the replicas is a single sparse matrix product.
+    """
+
+    def __init__(self, network, seed=None):
+        self.graph = network if isinstance(network, CSRGraph) else CSRGraph.from_networkx(network)
+        self.rng = np.random.default_rng(seed)
+        self.beta = None
+        self.recover_prob = None
+        self.p_0 = None
+        self.n_rep = None
+        self.iteration = None
+        self.infected_count = None
+        self.node_status = None
+        self._escape_prob = None
+        self.steps_saved = None
+        self.neighbor_visits = 0 #Instrumentation counters (cumulative)
+        self.rng_draws = 0
+
+    def set_initial_status(self, beta, recover_prob, p_0, n_rep=1):
+        self.beta = beta #Infection rate
+        self.recover_prob = recover_prob #Recovery rate
+        self.p_0 = p_0 #initial fraction of infected nodes
+        self.n_rep = n_rep #number of replicas simulated together
+        self.iteration = 0
+
+        #(1-β)^k for every possible number k of infected neighbours
+        self._escape_prob = (1.0 - beta) ** np.arange(self.graph.degree().max(initial=0) + 1)
+
+        #node_status[r, i] = True(Infected) or False(Susceptible) node i in replica r
+        self.node_status = self.rng.random((n_rep, len(self.graph))) < self.p_0
+        self.infected_count = np.count_nonzero(self.node_status, axis=1)
+
+    def iterate(self):
+        # Infected neighbours of every node in every replica, (N x n_rep)
+        k = self.graph.adjacency() @ self.node_status.T.astype(np.int32)
+
+        u = self.rng.random(self.node_status.shape)
+        infection_prob = 1.0 - self._escape_prob[k.T]
+
+        self.node_status = np.where(self.node_status, u >= self.recover_prob, u < infection_prob)
+        self.infected_count = np.count_nonzero(self.node_status, axis=1)
+
+        self.iteration += 1
+        self.neighbor_visits += len(self.graph.indices) * len(u)
+        self.rng_draws += u.size
+
+        return self.infected_count / len(self.graph), self.iteration
+
+    def run(self, beta, recover_prob, p_0, n_rep, t_max, t_trans, adaptive=False, z=1.0):
+        """ Simulates n_rep replicas for t_max steps and returns the average fraction
+        of infected nodes of each replica over the steps after t_trans.
+
+        In adaptive mode the replicas that get absorbed or become stationary are
+        dropped from the status matrix (see stationarity.StationarityMonitor) and
+        the steps saved by each replica are left in self.steps_saved.
+
+        Keyword arguments:
+        beta -- infection probability
+        recover_prob -- recovery probability μ
+        p_0 -- initial fraction of infected nodes
+        n_rep -- number of repetitions
+        t_max -- maximum number of time steps
+        t_trans -- number of steps of the transitory
+        adaptive -- stop replicas early (default False)
+        z -- tolerance of the stationarity test, in standard errors (default 1.0)
+        """
+        self.set_initial_status(beta, recover_prob, p_0, n_rep)
+
+        monitor = StationarityMonitor(n_rep, t_max, t_trans, adaptive, z)
+        active = np.arange(n_rep)
+
+        for _ in range(t_max):
+            p, _ = self.iterate()
+            finished = monitor.update(p, active)
+
+            if finished.any():
+                self.node_status = self.node_status[~finished]
+                active = active[~finished]
+                if len(active) == 0:
+                    break
+
+        self.steps_saved = monitor.steps_saved
+
+        return monitor.estimate
@@ -0,0 +1,80 @@
+import numpy as np
+import scipy.sparse as sp
+
+class CSRGraph():
+    """ Compact, read-only adjacency of an undirected graph in CSR form.
+
+    Node i (0..n-1) has its neighbours in indices[indptr[i]:indptr[i+1]].
+    The original node labels are kept in `nodes` so results can be mapped back.
+    """
+
+    def __init__(self, indptr, indices, nodes=None):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.n = len(self.indptr) - 1
+        self.nodes = list(range(self.n)) if nodes is None else list(nodes)
+        self._adjacency = None
+
+    @classmethod
+    def from_networkx(cls, network):
+        """ Compiles a networkx graph into CSR arrays (self-loops and parallel edges are dropped).
+
+        Keyword arguments:
+        network -- networkx graph
+        """
+        nodes = list(network)
+        index = {node: i for i, node in enumerate(nodes)}
+
+        edges = np.fromiter((v for u, w in network.edges() for v in (index[u], index[w])),
+                            dtype=np.int64, count=2 * network.number_of_edges()).reshape(-1, 2)
+
+        return cls.from_edges(len(nodes), edges, nodes)
+
+    @classmethod
+    def from_edges(cls, n, edges, nodes=None):
+        """ Builds the CSR arrays from an (m x 2) array of 0-based undirected edges.
+
+        Keyword arguments:
+        n -- number of nodes
+        edges -- integer array with one edge per row
+        nodes -- node labels (default 0..n-1)
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+
+        #Both directions, sorted by source and without duplicates
+        src = np.concatenate((edges[:, 0], edges[:, 1]))
+        dst = np.concatenate((edges[:, 1], edges[:, 0]))
+        keys = np.unique(src * n + dst)
+        src, dst = np.divmod(keys, n)
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+        return cls(indptr, dst, nodes)
+
+    def __len__(self):
+        return self.n
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def adjacency(self):
+        """ Returns (and caches) the adjacency as a scipy CSR matrix sharing the index arrays. """
+        if self._adjacency is None:
+            data = np.ones(len(self.indices), dtype=np.int32)
+            self._adjacency = sp.csr_matrix((data, self.indices, self.indptr), shape=(self.n, self.n))
+
+        return self._adjacency
+
+    def __getstate__(self):
+        #The scipy matrix is rebuilt lazily, no need to ship it around
+        state = self.__dict__.copy()
+        state['_adjacency'] = None
+        return state
@@ -0,0 +1,144 @@
+import numpy as np
+
+from A4_project.model.CSRGraph import CSRGraph
+
+class Spontaneous():
+    """ Transition source -> target happening with probability `prob` at each time step. """
+
+    def __init__(self, source, target, prob):
+        self.source = source
+        self.target = target
+        self.prob = prob
+
+class Induced():
+    """ Transition source -> target caused by the neighbours in state `inducer`: each one of
+    them triggers it with probability `prob`, so a node with k of them changes with
+    probability 1-(1-prob)^k. """
+
+    def __init__(self, source, target, prob, inducer):
+        self.source = source
+        self.target = target
+        self.prob = prob
+        self.inducer = inducer
+
+class CompartmentalModel():
+    """ Discrete-time compartmental dynamics on a network with a vectorized step.
+
+    States are small integer codes (their position in `states`) kept in a numpy array.
+    A transition probability can be a number or the name of a parameter set with
+    set_parameters(). All the transitions of a step are computed from the status at time t
+    with one uniform number per node; when a state has several outgoing transitions they are
+    tried in declaration order, as independent trials.
+
+    Keyword arguments:
+    network -- networkx graph or CSRGraph
+    states -- state names, e.g. ['S', 'I', 'R']
+    transitions -- list of Spontaneous/Induced transitions between those names
+    seed -- seed of the random generator (default None)
+    """
+
+    def __init__(self, network, states, transitions, seed=None):
+        self.graph = network if isinstance(network, CSRGraph) else CSRGraph.from_networkx(network)
+        self.rng = np.random.default_rng(seed)
+        self.states = list(states)
+        self.codes = {state: code for code, state in enumerate(self.states)}
+        self.transitions = transitions
+        self.params = {}
+        self._escape_prob = {}
+        self.status = None
+        self.iteration = None
+        self.neighbor_visits = 0 #Instrumentation counters (cumulative)
+        self.rng_draws = 0
+
+        for transition in transitions:
+            for state in (transition.source, transition.target, getattr(transition, 'inducer', transition.source)):
+                if state not in self.codes:
+                    raise Exception(f'Unknown state {state}. Valid states: {self.states}')
+
+        self._inducers = sorted({self.codes[t.inducer] for t in transitions if isinstance(t, Induced)})
+
+    def set_parameters(self, **params):
+        self.params.update(params)
+        self._escape_prob = {}
+
+    def _prob(self, transition):
+        return self.params[transition.prob] if isinstance(transition.prob, str) else transition.prob
+
+    def set_initial_state(self, fractions):
+        """ Assigns every node a random state: state s with probability fractions[s] and the
+        first state of the model otherwise.
+
+        Keyword arguments:
+        fractions -- dict state name -> initial fraction of nodes
+        """
+        u = self.rng.random(len(self.graph))
+        self.status = np.zeros(len(self.graph), dtype=np.uint8)
+        self.iteration = 0
+
+        lower = 0.0
+        for state, fraction in fractions.items():
+            self.status[(u >= lower) & (u < lower + fraction)] = self.codes[state]
+            lower += fraction
+
+    def _escape(self, prob, k):
+        #(1-prob)^k through a lookup table per probability
+        if prob not in self._escape_prob:
+            self._escape_prob[prob] = (1.0 - prob) ** np.arange(self.graph.degree().max(initial=0) + 1)
+        return self._escape_prob[prob][k]
+
+    def step(self):
+        """ Advances one time step and returns the new status array. """
+        adjacency = self.graph.adjacency()
+
+        #Number of neighbours in each inducer state, at time t
+        neighbours = {code: adjacency @ (self.status == code).astype(np.int32) for code in self._inducers}
+
+        u = self.rng.random(len(self.graph))
+        new_status = self.status.copy()
+
+        for code in range(len(self.states)):
+            outgoing = [t for t in self.transitions if self.codes[t.source] == code]
+            if not outgoing:
+                continue
+
+            in_state = self.status == code
+            stay = 1.0 #probability that none of the previous transitions happened
+            for transition in outgoing:
+                prob = self._prob(transition)
+                if isinstance(transition, Induced):
+                    next_stay = stay * self._escape(prob, neighbours[self.codes[transition.inducer]])
+                else:
+                    next_stay = stay * (1.0 - prob)
+
+                fire = in_state & (u >= 1.0 - stay) & (u < 1.0 - next_stay)
+                new_status[fire] = self.codes[transition.target]
+                stay = next_stay
+
+        self.status = new_status
+        self.iteration += 1
+        self.neighbor_visits += len(self.graph.indices) * len(self._inducers)
+        self.rng_draws += len(self.graph)
+
+        return self.status
+
+    def counts(self):
+        """ Returns a dict state name -> fraction of nodes in that state. """
+        counts = np.bincount(self.status, minlength=len(self.states)) / len(self.graph)
+        return dict(zip(self.states, counts.tolist()))
+
+def make_sir(network, seed=None):
+    """ SIR: parameters beta (infection) and recover_prob. """
+    return CompartmentalModel(network, ['S', 'I', 'R'],
+                              [Induced('S', 'I', 'beta', 'I'), Spontaneous('I', 'R', 'recover_prob')], seed)
+
+def make_sirs(network, seed=None):
+    """ SIRS: parameters beta (infection), recover_prob and waning_prob (loss of immunity). """
+    return CompartmentalModel(network, ['S', 'I', 'R'],
+                              [Induced('S', 'I', 'beta', 'I'), Spontaneous('I', 'R', 'recover_prob'),
+                               Spontaneous('R', 'S', 'waning_prob')], seed)
+
+def make_seis(network, seed=None):
+    """ SEIS: parameters beta (exposure), incubation_prob (E -> I) and recover_prob. """
+    return CompartmentalModel(network, ['S', 'E', 'I'],
+                              [Induced('S', 'E', 'beta', 'I'), Spontaneous('E', 'I', 'incubation_prob'),
+                               Spontaneous('I', 'S', 'recover_prob')], seed)
@@ -0,0 +1,46 @@
+import numpy as np
+
+from A4_project.model.Compartmental import CompartmentalModel, Induced, Spontaneous
+
+class FastSIS(CompartmentalModel):
+    """ Vectorized SIS model over a CSR compiled graph.
+
+    Same interface and dynamics as SIS.SIS, as a preset of the compartmental model:
+    S -> I induced by infected neighbours with probability β each (1-(1-β)^k) and
+    I -> S with probability µ.
+    """
+
+    def __init__(self, network, seed=None):
+        super().__init__(network, ['S', 'I'],
+                         [Induced('S', 'I', 'beta', 'I'), Spontaneous('I', 'S', 'recover_prob')], seed)
+        self.beta = None
+        self.recover_prob = None
+        self.p_0 = None
+        self.infected_count = None
+
+    @property
+    def node_status(self):
+        #node_status[i] = True(Infected) or False(Susceptible)
+        return self.status == self.codes['I']
+
+    @node_status.setter
+    def node_status(self, infected):
+        self.status = np.where(infected, self.codes['I'], self.codes['S']).astype(np.uint8)
+
+    def is_node_infected(self, node):
+        return bool(self.node_status[self.graph.nodes.index(node)])
+
+    def set_initial_status(self, beta, recover_prob, p_0):
+        self.beta = beta #Infection rate
+        self.recover_prob = recover_prob #Recovery rate
+        self.p_0 = p_0 #initial fraction of infected nodes
+
+        self.set_parameters(beta=beta, recover_prob=recover_prob)
+        self.set_initial_state({'I': p_0})
+        self.infected_count = int(np.count_nonzero(self.node_status))
+
+    def iterate(self):
+        self.step()
+        self.infected_count = int(np.count_nonzero(self.node_status))
+
+        return self.infected_count / len(self.graph), self.iteration
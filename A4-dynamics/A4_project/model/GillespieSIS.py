@@ -0,0 +1,149 @@
+import math
+import random
+
+from A4_project.model.CSRGraph import CSRGraph
+
+class GillespieSIS():
+    """ Continuous-time SIS model simulated event by event (optimized Gillespie algorithm).
+
+    Infected nodes recover with rate µ and every infected node transmits the disease through
+    each of its edges with rate β. Only the list of infected nodes and the number of edges
+    leaving them are tracked, so the cost grows with the number of events instead of N x t_max:
+      - a recovery is applied to a uniformly chosen infected node,
+      - an infection picks an infected node with probability proportional to its degree
+        (rejection sampling against the maximum degree) and one of its neighbours at random;
+        if the neighbour is already infected nothing happens (phantom event).
+
+    iterate() advances the clock by one time unit, so the prevalence series is comparable with
+    the one of the discrete-time models (note that β and µ are rates here, not probabilities).
+    """
+
+    def __init__(self, network, seed=None):
+        graph = network if isinstance(network, CSRGraph) else CSRGraph.from_networkx(network)
+        self.graph = graph
+
+        #Plain python lists are much faster than numpy arrays for scalar access
+        self._indptr = graph.indptr.tolist()
+        self._indices = graph.indices.tolist()
+        self._degree = graph.degree().tolist()
+        self._max_degree = max(self._degree, default=0)
+
+        self.rng = random.Random(seed)
+        self.beta = None
+        self.recover_prob = None
+        self.p_0 = None
+        self.iteration = None
+        self.infected_count = None
+        self.time = None
+        self.events = None
+        self.neighbor_visits = 0 #Instrumentation counters (cumulative)
+        self.rng_draws = 0
+
+    def is_node_infected(self, node):
+        return self._position[self.graph.nodes.index(node)] >= 0
+
+    def set_initial_status(self, beta, recover_prob, p_0):
+        self.beta = beta #Infection rate
+        self.recover_prob = recover_prob #Recovery rate
+        self.p_0 = p_0 #initial fraction of infected nodes
+        self.iteration = 0
+        self.time = 0.0
+        self.events = 0
+
+        #_infected: list of infected nodes, _position[node]: index in _infected or -1 (susceptible)
+        self._infected = []
+        self._position = [-1] * len(self.graph)
+        self._infected_edges = 0
+
+        for node in range(len(self.graph)):
+            if self.rng.random() < self.p_0:
+                self._infect(node)
+
+        self.infected_count = len(self._infected)
+
+    def _infect(self, node):
+        self._position[node] = len(self._infected)
+        self._infected.append(node)
+        self._infected_edges += self._degree[node]
+
+    def _recover(self, node):
+        #Swap with the last infected node and pop
+        last = self._infected.pop()
+        idx = self._position[node]
+        if last != node:
+            self._infected[idx] = last
+            self._position[last] = idx
+        self._position[node] = -1
+        self._infected_edges -= self._degree[node]
+
+    def run_until(self, t_end):
+        """ Applies events until the clock reaches t_end and returns the fraction of infected nodes.
+
+        Keyword arguments:
+        t_end -- simulation time to reach
+        """
+        rng = self.rng
+        infected = self._infected
+        neighbor_visits = 0
+        rng_draws = 0
+
+        while self.time < t_end:
+            recovery_rate = self.recover_prob * len(infected)
+            total_rate = recovery_rate + self.beta * self._infected_edges
+
+            if total_rate == 0: #Absorbing state
+                self.time = t_end
+                break
+
+            self.time -= math.log(1.0 - rng.random()) / total_rate
+            rng_draws += 1
+            if self.time >= t_end:
+                #The process is memoryless, the pending event can be discarded
+                self.time = t_end
+                break
+
+            self.events += 1
+            if rng.random() * total_rate < recovery_rate:
+                self._recover(infected[int(rng.random() * len(infected))])
+                rng_draws += 2
+            else:
+                while True:
+                    node = infected[int(rng.random() * len(infected))]
+                    rng_draws += 2
+                    if rng.random() * self._max_degree < self._degree[node]:
+                        break
+
+                neighbor = self._indices[self._indptr[node] + int(rng.random() * self._degree[node])]
+                neighbor_visits += 1
+                rng_draws += 2
+                if self._position[neighbor] < 0:
+                    self._infect(neighbor)
+
+        self.infected_count = len(infected)
+        self.neighbor_visits += neighbor_visits
+        self.rng_draws += rng_draws
+
+        return self.infected_count / len(self.graph)
+
+    def iterate(self):
+        self.iteration += 1
+
+        return self.run_until(float(self.iteration)), self.iteration
+
+    def time_series(self, t_max, dt=1.0):
+        """ Returns the sampling times and the fraction of infected nodes at each of them.
+
+        Keyword arguments:
+        t_max -- final time
+        dt -- sampling interval (default 1.0)
+        """
+        times = []
+        prevalence = []
+
+        t = self.time
+        while t + dt <= t_max:
+            t += dt
+            times.append(t)
+            prevalence.append(self.run_until(t))
+
+        return times, prevalence
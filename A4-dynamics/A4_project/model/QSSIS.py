@@ -0,0 +1,77 @@
+import numpy as np
+
+from A4_project.model.FastSIS import FastSIS
+
+class QuasiStationarySIS():
+    """ Quasi-stationary (QS) simulation method on top of a FastSIS model.
+
+    Every time the dynamics reaches the absorbing state the system is moved to an active
+    configuration drawn from a stored history, so near the epidemic threshold every step
+    samples the surviving regime. The history stores the first history_size active
+    configurations and is then refreshed: after each step one random entry is replaced by
+    the current configuration with probability replace_prob.
+
+    Reports the QS prevalence <ρ> and the susceptibility χ = N (<ρ²> - <ρ>²) / <ρ>, whose
+    peak locates the threshold.
+    """
+
+    def __init__(self, model, history_size=100, replace_prob=0.1):
+        if not isinstance(model, FastSIS):
+            raise Exception(f'QuasiStationarySIS needs a FastSIS model, not {type(model).__name__}')
+
+        self.model = model
+        self.history_size = history_size
+        self.replace_prob = replace_prob
+        self.history = None
+        self.resets = None
+
+    def run(self, beta, recover_prob, p_0, t_max, t_trans):
+        """ Runs a QS simulation and returns the QS prevalence and susceptibility averaged
+        over the steps after t_trans.
+
+        Keyword arguments:
+        beta -- infection probability
+        recover_prob -- recovery probability μ
+        p_0 -- initial fraction of infected nodes
+        t_max -- number of time steps
+        t_trans -- number of steps of the transitory
+        """
+        s = self.model
+        rng = s.rng
+        n = len(s.graph)
+
+        s.set_initial_status(beta, recover_prob, p_0)
+        if s.infected_count == 0:
+            infected = s.node_status
+            infected[rng.integers(n)] = True
+            s.node_status = infected
+            s.infected_count = 1
+
+        self.history = [s.node_status.copy()]
+        self.resets = 0
+
+        rho_sum = 0.0
+        rho2_sum = 0.0
+
+        for t in range(t_max):
+            rho, _ = s.iterate()
+
+            if s.infected_count == 0:
+                s.node_status = self.history[rng.integers(len(self.history))].copy()
+                s.infected_count = int(np.count_nonzero(s.node_status))
+                rho = s.infected_count / n
+                self.resets += 1
+            elif len(self.history) < self.history_size:
+                self.history.append(s.node_status.copy())
+            elif rng.random() < self.replace_prob:
+                self.history[rng.integers(self.history_size)] = s.node_status.copy()
+
+            if t >= t_trans:
+                rho_sum += rho
+                rho2_sum += rho * rho
+
+        steps = t_max - t_trans
+        rho_mean = rho_sum / steps
+        chi = n * (rho2_sum / steps - rho_mean ** 2) / rho_mean
+
+        return rho_mean, chi
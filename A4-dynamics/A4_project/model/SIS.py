@@ -10,6 +10,8 @@ class SIS():
         self.p_0 = None
         self.iteration = None
         self.infected_count = None
+        self.neighbor_visits = 0 #Instrumentation counters (cumulative)
+        self.rng_draws = 0
 
     def is_node_infected(self, node):
         #TODO Remove assert
@@ -35,6 +37,8 @@ class SIS():
     def iterate(self):
         current_node_status =  copy.deepcopy(self.node_status)
         self.infected_count = 0
+        neighbor_visits = 0
+        rng_draws = 0
         
         for node, currently_infected in current_node_status.items():
             # For each infected node at time step t, we recover it with probability µ: we generate
@@ -44,19 +48,25 @@ class SIS():
             if(currently_infected):
                 #If random is < than recover probability, set as NOT infected
                 self.node_status[node] = not (random.random() < self.recover_prob)
+                rng_draws += 1
 
             # For each susceptible node at time step t, we traverse all of its neighbors. For each
             # infected neighbor (at time step t), the reference node becomes infected with
             # probability β. 
             else:
                 for neighbor in self.network.neighbors(node):
-                    if(current_node_status[neighbor] and random.random() < self.beta):
-                        self.node_status[node] = True
-                        break
+                    neighbor_visits += 1
+                    if(current_node_status[neighbor]):
+                        rng_draws += 1
+                        if(random.random() < self.beta):
+                            self.node_status[node] = True
+                            break
         
             self.infected_count += 1 if self.node_status[node] else 0
 
         self.iteration += 1
+        self.neighbor_visits += neighbor_visits
+        self.rng_draws += rng_draws
 
         current_node_status = None
 
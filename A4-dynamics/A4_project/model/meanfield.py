@@ -0,0 +1,125 @@
+import numpy as np
+import scipy.sparse.linalg as spla
+
+from A4_project.model.CSRGraph import CSRGraph
+
+def _csr(network):
+    return network if isinstance(network, CSRGraph) else CSRGraph.from_networkx(network)
+
+def hmf_threshold(network, recover_prob):
+    """ Heterogeneous mean-field epidemic threshold β_c = μ <k> / <k²>.
+
+    Keyword arguments:
+    network -- networkx graph or CSRGraph
+    recover_prob -- recovery probability μ
+    """
+    k = _csr(network).degree().astype(float)
+    return recover_prob * k.mean() / (k ** 2).mean()
+
+def hmf_prevalence(network, beta, recover_prob, tol=1e-10):
+    """ Heterogeneous mean-field stationary prevalence.
+
+    With λ = β/μ, ρ_k = λkΘ / (1 + λkΘ) and Θ = Σ_k k P(k) ρ_k / <k>; the non trivial
+    solution Θ is found by bisection.
+
+    Keyword arguments:
+    network -- networkx graph or CSRGraph
+    beta -- infection probability
+    recover_prob -- recovery probability μ
+    tol -- tolerance of Θ (default 1e-10)
+    """
+    k = _csr(network).degree().astype(float)
+    lam = beta / recover_prob
+
+    def theta_map(theta):
+        return np.mean(k * lam * k * theta / (1 + lam * k * theta)) / k.mean()
+
+    if lam == 0 or lam <= hmf_threshold(network, 1.0):
+        return 0.0
+
+    lo, hi = tol, 1.0
+    while hi - lo > tol:
+        mid = (lo + hi) / 2
+        if theta_map(mid) > mid:
+            lo = mid
+        else:
+            hi = mid
+
+    theta = (lo + hi) / 2
+    return float(np.mean(lam * k * theta / (1 + lam * k * theta)))
+
+def leading_eigenvalue(network):
+    """ Largest eigenvalue of the adjacency matrix (sparse Lanczos). """
+    a = _csr(network).adjacency().astype(float)
+    if a.shape[0] < 3:
+        return float(np.linalg.eigvalsh(a.toarray()).max(initial=0))
+
+    return float(spla.eigsh(a, k=1, which='LA', return_eigenvectors=False)[0])
+
+def qmf_threshold(network, recover_prob):
+    """ Quenched mean-field epidemic threshold β_c = μ / Λ_max.
+
+    Keyword arguments:
+    network -- networkx graph or CSRGraph
+    recover_prob -- recovery probability μ
+    """
+    return recover_prob / leading_eigenvalue(network)
+
+def qmf_prevalence(network, beta, recover_prob, p_0=1.0, tol=1e-8, max_iter=10000):
+    """ Quenched (individual based) mean-field stationary prevalence of the discrete-time SIS.
+
+    Iterates p_i(t+1) = (1 - q_i)(1 - p_i) + (1 - μ) p_i with q_i = Π_j (1 - β A_ij p_j)
+    (probability of not being infected by any neighbour) until it converges.
+
+    Keyword arguments:
+    network -- networkx graph or CSRGraph
+    beta -- infection probability
+    recover_prob -- recovery probability μ
+    p_0 -- initial infection probability of every node (default 1.0)
+    tol -- maximum change of the probabilities at convergence (default 1e-8)
+    max_iter -- maximum number of iterations (default 10000)
+    """
+    a = _csr(network).adjacency()
+    p = np.full(a.shape[0], p_0, dtype=float)
+
+    with np.errstate(divide='ignore'):
+        for _ in range(max_iter):
+            q = np.exp(a @ np.log1p(-beta * p))
+            p_next = (1 - q) * (1 - p) + (1 - recover_prob) * p
+
+            if np.abs(p_next - p).max(initial=0) < tol:
+                p = p_next
+                break
+            p = p_next
+
+    return float(p.mean())
+
+def plan_betas(betas, beta_c, skip_factor=0.5):
+    """ Splits betas in the ones to simulate and the ones far enough below the threshold
+    (β < skip_factor·β_c) to be taken as P(β) = 0.
+
+    Keyword arguments:
+    betas -- infection probabilities
+    beta_c -- predicted epidemic threshold
+    skip_factor -- fraction of β_c below which betas are skipped (default 0.5)
+    """
+    simulate = [beta for beta in betas if beta >= skip_factor * beta_c]
+    skip = [beta for beta in betas if beta < skip_factor * beta_c]
+
+    return simulate, skip
+
+def refine_betas(betas, ps, n_new):
+    """ Returns up to n_new new betas: the midpoints of the intervals where P(β) changes the most.
+
+    Keyword arguments:
+    betas -- sorted infection probabilities already simulated
+    ps -- P(β) of each beta
+    n_new -- number of betas to add
+    """
+    if len(betas) < 2 or n_new <= 0:
+        return []
+
+    jumps = np.abs(np.diff(ps))
+    intervals = np.argsort(-jumps, kind='stable')[:n_new]
+
+    return sorted((betas[i] + betas[i + 1]) / 2 for i in intervals if jumps[i] > 0)
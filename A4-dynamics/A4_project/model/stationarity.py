@@ -0,0 +1,111 @@
+import numpy as np
+
+class StationarityMonitor():
+    """ Follows the fraction of infected nodes of a set of replicas and computes their
+    stationary average (mean over the steps after t_trans).
+
+    In adaptive mode a replica is finished as soon as
+      - it reaches the absorbing state (no infected nodes): the rest of the stationary
+        window is known to be 0, or
+      - the means of its last two windows of (t_max - t_trans) steps agree within
+        z standard errors (running mean/variance test): its last window is used as
+        the stationary average.
+    """
+
+    def __init__(self, n_rep, t_max, t_trans, adaptive=False, z=1.0):
+        self.t_max = t_max
+        self.t_trans = t_trans
+        self.window = t_max - t_trans
+        self.adaptive = adaptive
+        self.z = z
+        self.t = 0
+
+        #Last 2*window values of every replica (ring buffer) and the running sums of both windows
+        self._history = np.zeros((2 * self.window, n_rep))
+        self._sum_last = np.zeros(n_rep)
+        self._sq_last = np.zeros(n_rep)
+        self._sum_prev = np.zeros(n_rep)
+        self._sq_prev = np.zeros(n_rep)
+        self._stationary_sum = np.zeros(n_rep)
+
+        self.estimate = np.zeros(n_rep)
+        self.steps_run = np.full(n_rep, t_max)
+
+    @property
+    def steps_saved(self):
+        return self.t_max - self.steps_run
+
+    def update(self, p, rows):
+        """ Adds the fraction of infected nodes p of the replicas in rows (one time step) and
+        returns a boolean mask over rows with the replicas that are finished.
+
+        Keyword arguments:
+        p -- fraction of infected nodes of each replica in rows
+        rows -- replica indices
+        """
+        w = self.window
+        entering = self._history[(self.t - w) % (2 * w), rows] #leaves the last window, enters the previous one
+        leaving = self._history[self.t % (2 * w), rows]        #leaves the previous window
+
+        self._sum_last[rows] += p - entering
+        self._sq_last[rows] += p * p - entering * entering
+        self._sum_prev[rows] += entering - leaving
+        self._sq_prev[rows] += entering * entering - leaving * leaving
+        self._history[self.t % (2 * w), rows] = p
+
+        if self.t >= self.t_trans:
+            self._stationary_sum[rows] += p
+
+        self.t += 1
+
+        if self.t == self.t_max:
+            self._finish(rows, self._stationary_sum[rows] / w)
+            return np.ones(len(rows), dtype=bool)
+
+        if not self.adaptive:
+            return np.zeros(len(rows), dtype=bool)
+
+        #Absorbing state: no more infected nodes in the remaining steps
+        absorbed = p == 0
+        self._finish(rows[absorbed], self._stationary_sum[rows[absorbed]] / w)
+
+        stationary = np.zeros(len(rows), dtype=bool)
+        if self.t >= 2 * w:
+            m_last = self._sum_last[rows] / w
+            m_prev = self._sum_prev[rows] / w
+            v_last = np.maximum(self._sq_last[rows] / w - m_last ** 2, 0)
+            v_prev = np.maximum(self._sq_prev[rows] / w - m_prev ** 2, 0)
+
+            stationary = ~absorbed & (np.abs(m_last - m_prev) <= self.z * np.sqrt((v_last + v_prev) / w))
+            self._finish(rows[stationary], m_last[stationary])
+
+        return absorbed | stationary
+
+    def _finish(self, rows, estimate):
+        self.estimate[rows] = estimate
+        self.steps_run[rows] = self.t
+
+def run_replica(s, beta, recover_prob, p_0, t_max, t_trans, adaptive=False, z=1.0):
+    """ Runs one simulation with a single replica model (SIS.SIS or FastSIS.FastSIS) and returns
+    its stationary average and the number of steps saved by the adaptive mode.
+
+    Keyword arguments:
+    s -- SIS model
+    beta -- infection probability
+    recover_prob -- recovery probability μ
+    p_0 -- initial fraction of infected nodes
+    t_max -- maximum number of time steps
+    t_trans -- number of steps of the transitory
+    adaptive -- stop on absorption or once the regime is stationary (default False)
+    z -- tolerance of the stationarity test, in standard errors (default 1.0)
+    """
+    monitor = StationarityMonitor(1, t_max, t_trans, adaptive, z)
+    rows = np.zeros(1, dtype=int)
+
+    s.set_initial_status(beta, recover_prob, p_0)
+    for _ in range(t_max):
+        p, _ = s.iterate()
+        if monitor.update(np.asarray([p]), rows)[0]:
+            break
+
+    return monitor.estimate[0], int(monitor.steps_saved[0])
@@ -0,0 +1,166 @@
+import cProfile
+import os
+import pstats
+import sys
+import time
+
+try:
+    import resource
+except ImportError: #Not available on Windows
+    resource = None
+
+class StepStats():
+    """ Running totals of the iterate() calls of a model (no per-step lists are kept,
+    so it is cheap enough to leave it enabled in production sweeps). """
+
+    def __init__(self):
+        self.steps = 0
+        self.time = 0.0
+        self.max_time = 0.0
+        self.neighbor_visits = 0
+        self.rng_draws = 0
+        self.process_peak_rss_mb = None
+
+    def add(self, elapsed, neighbor_visits, rng_draws):
+        self.steps += 1
+        self.time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.neighbor_visits += neighbor_visits
+        self.rng_draws += rng_draws
+
+    def finish(self):
+        """ Records the peak resident memory of the process so far (MB). It is the peak over the
+        whole life of the process, not of this cell only, so it never goes down between cells. """
+        if resource is not None:
+            #ru_maxrss is in bytes on macOS and in KB on Linux
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.process_peak_rss_mb = max_rss / 1024 ** 2 if sys.platform == 'darwin' else max_rss / 1024
+        return self
+
+def _timed_iterate(model):
+    stats = model.step_stats
+    visits, draws = model.neighbor_visits, model.rng_draws
+
+    start = time.perf_counter()
+    result = model._uninstrumented_iterate()
+    stats.add(time.perf_counter() - start, model.neighbor_visits - visits, model.rng_draws - draws)
+
+    return result
+
+def instrument(model, stats=None):
+    """ Makes every iterate() call of the model (also the ones done internally, e.g. by
+    BatchSIS.run) record its wall time, neighbour visits and random draws in a StepStats.
+    Calling it again on the same model just switches to a new StepStats.
+
+    Keyword arguments:
+    model -- SIS, FastSIS, BatchSIS or GillespieSIS model
+    stats -- StepStats to fill (default a new one)
+    """
+    stats = StepStats() if stats is None else stats
+
+    if not hasattr(model, '_uninstrumented_iterate'):
+        model._uninstrumented_iterate = model.iterate
+        model.iterate = lambda: _timed_iterate(model)
+
+    model.step_stats = stats
+
+    return stats
+
+class SummaryTable():
+    """ Per (network, μ, β) aggregation of StepStats. """
+
+    columns = ['network', 'mu', 'beta', 'steps', 'total_s', 'ms_per_step', 'max_ms_per_step',
+               'neighbor_visits_per_step', 'rng_draws_per_step', 'process_peak_rss_mb']
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, network, mu, beta, stats):
+        steps = max(stats.steps, 1)
+        self.rows.append([network, mu, beta, stats.steps, stats.time,
+                          1000 * stats.time / steps, 1000 * stats.max_time,
+                          stats.neighbor_visits / steps, stats.rng_draws / steps,
+                          stats.process_peak_rss_mb])
+
+    def __str__(self):
+        lines = ['\t'.join(self.columns)]
+        for row in self.rows:
+            lines.append('\t'.join(f'{value:.4g}' if isinstance(value, float) else str(value) for value in row))
+        return '\n'.join(lines)
+
+    def save(self, out_file):
+        """ Merges the rows into out_file: the rows of the (network, μ, β) cells in this table
+        replace the stored ones and the other stored rows are kept, so resumed or partial runs
+        do not lose earlier measurements. Nothing is written when the table is empty. """
+        if not self.rows:
+            return
+
+        directory = os.path.dirname(out_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        lines = str(self).split('\n')
+        new_keys = {tuple(line.split('\t')[:3]) for line in lines[1:]}
+
+        kept = []
+        if os.path.exists(out_file):
+            with open(out_file, 'r') as f:
+                stored = f.read().splitlines()
+            if stored and stored[0] == lines[0]:
+                kept = [line for line in stored[1:] if line and tuple(line.split('\t')[:3]) not in new_keys]
+            elif stored:
+                #Written with other columns: kept aside instead of mixed
+                os.replace(out_file, out_file + '.old')
+
+        tmp_file = f'{out_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w') as f:
+            f.write('\n'.join([lines[0]] + kept + lines[1:]) + '\n')
+        os.replace(tmp_file, out_file)
+
+class Profiler():
+    """ Optional deep-dive profiler of the whole run: 'cprofile', 'pyinstrument' or None (disabled).
+    Only the main process is profiled, use workers = 1 in the sweeps to see the simulation. """
+
+    def __init__(self, tool, out_file):
+        self.tool = tool
+        self.out_file = out_file
+        self._profiler = None
+
+    def start(self):
+        if self.tool == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.tool == 'pyinstrument':
+            from pyinstrument import Profiler as Pyinstrument #optional dependency
+            self._profiler = Pyinstrument()
+            self._profiler.start()
+        elif self.tool is not None:
+            raise Exception(f'Unknown profiler {self.tool}. Use cprofile, pyinstrument or None.')
+
+        return self
+
+    def stop(self):
+        if self._profiler is None:
+            return
+
+        directory = os.path.dirname(self.out_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        if self.tool == 'cprofile':
+            self._profiler.disable()
+            self._profiler.dump_stats(self.out_file + '.prof')
+            pstats.Stats(self._profiler).sort_stats('cumulative').print_stats(20)
+        else:
+            self._profiler.stop()
+            with open(self.out_file + '.html', 'w') as f:
+                f.write(self._profiler.output_html())
+            print(self._profiler.output_text())
+
+        self._profiler = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
@@ -0,0 +1,102 @@
+import json
+import os
+
+from A4_project.utils import utils
+
+class ResultStore():
+    """ Append-only JSONL store with one line per simulated (network, μ, β) cell, and per
+    cell skipped by the threshold sweep (skipped = True, P = 0).
+
+    Every line holds the simulation parameters, P(β), the stationary average of each
+    replica and the seed/final state of the random generator, so an interrupted sweep
+    can be resumed and the plots regenerated without simulating again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+
+        if os.path.exists(path):
+            with open(path, 'rb+') as f:
+                content = f.read()
+                #Last line of a crashed run: cut it, so the next record starts on its own line
+                if content and not content.endswith(b'\n'):
+                    content = content[:content.rfind(b'\n') + 1]
+                    f.truncate(len(content))
+
+            for line in content.decode('utf-8').splitlines():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.records[self.key(**record)] = record
+
+    @staticmethod
+    def run_key(network, p_0, n_rep, t_max, t_trans, adaptive, sweep_seed=None, backend=None, **_):
+        """ Parameters of the run a record belongs to (all but μ and β). """
+        #Records written before sweep_seed and backend were stored never match a new run
+        if isinstance(sweep_seed, list):
+            sweep_seed = tuple(sweep_seed)
+        return (network, p_0, n_rep, t_max, t_trans, adaptive, sweep_seed, backend)
+
+    @staticmethod
+    def key(network, mu, beta, p_0, n_rep, t_max, t_trans, adaptive, sweep_seed=None, backend=None, **_):
+        return ResultStore.run_key(network, p_0, n_rep, t_max, t_trans, adaptive, sweep_seed, backend) + (mu, beta)
+
+    def get(self, network, mu, beta, p_0, n_rep, t_max, t_trans, adaptive, sweep_seed, backend, skipped=False):
+        """ Returns the stored record of a cell or None. A cell is only the same when it was
+        simulated with the same root seed of the sweep and the same backend. Cells stored as
+        skipped by the threshold sweep (P = 0 without simulating) are only returned with
+        skipped=True. """
+        record = self.records.get(self.key(network, mu, beta, p_0, n_rep, t_max, t_trans, adaptive, sweep_seed, backend))
+        if record is not None and record.get('skipped', False) and not skipped:
+            return None
+        return record
+
+    def append(self, record):
+        """ Writes a record to disk (flushed, so it survives a crash) and keeps it in memory. """
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.records[self.key(**record)] = record
+
+    def curves(self, **params):
+        """ Returns a dict (run_key, μ) -> (betas, ps) with the stored cells sorted by beta,
+        skipped ones included (P = 0), so the curves are the ones of the live run.
+
+        Keyword arguments:
+        params -- run parameters (p_0, n_rep, t_max, t_trans, adaptive, sweep_seed, backend...)
+                  the records must have (default none, every record)
+        """
+        wanted = {name: tuple(value) if isinstance(value, list) else value for name, value in params.items()}
+
+        curves = {}
+        for record in self.records.values():
+            values = {name: tuple(record.get(name)) if isinstance(record.get(name), list) else record.get(name) for name in wanted}
+            if values != wanted:
+                continue
+            curves.setdefault((self.run_key(**record), record['mu']), {})[record['beta']] = record['p']
+
+        return {key: (sorted(curve), [curve[beta] for beta in sorted(curve)]) for key, curve in curves.items()}
+
+def plot_from_store(path, workers=None, **params):
+    """ Regenerates, in parallel, the P(β) images of every network and μ stored in a results
+    file whose data changed since they were last drawn.
+
+    Keyword arguments:
+    path -- JSONL results file
+    workers -- number of processes (default all the cores)
+    params -- run parameters of the curves to draw (see ResultStore.curves); they should fix
+              every run parameter but the network, as runs of one network and μ share an image
+    """
+    batch = utils.figures.FigureBatch(workers)
+    for ((network_path, p_0, *_), recover_probability), (betas, ps) in ResultStore(path).curves(**params).items():
+        utils.plot(network_path, ps, betas, recover_probability, p_0, batch=batch)
+
+    return batch.render()
@@ -0,0 +1,179 @@
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from A4_project.model import meanfield
+from A4_project.model.BatchSIS import BatchSIS
+from A4_project.model.CSRGraph import CSRGraph
+from A4_project.utils import profiling
+
+#Graph of the current worker process, set once by _init_worker
+_graph = None
+
+def _init_worker(graph):
+    global _graph
+    _graph = graph
+
+def _run_cell(task):
+    recover_probability, beta, seed, p_0, n_rep, t_max, t_trans, adaptive, instrumented = task
+
+    s = BatchSIS(_graph, seed=seed)
+    stats = profiling.instrument(s) if instrumented else None
+
+    stationary = s.run(beta, recover_probability, p_0, n_rep, t_max, t_trans, adaptive)
+    if stats is not None:
+        stats.finish()
+
+    return stationary, s.steps_saved, s.rng.bit_generator.state, stats
+
+def _executor(graph, workers):
+    """ Returns a process pool whose workers already hold the graph (None when workers == 1). """
+    workers = workers or os.cpu_count()
+
+    if workers == 1:
+        _init_worker(graph)
+        return None
+
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph,))
+
+def _params(seed, p_0, n_rep, t_max, t_trans, adaptive):
+    #Run parameters stored with every cell (the store key without the network, μ and β)
+    return {'p_0': p_0, 'n_rep': n_rep, 't_max': t_max, 't_trans': t_trans, 'adaptive': adaptive,
+            'sweep_seed': seed, 'backend': 'batch'}
+
+def _simulate(executor, cells, seed, seeds, p_0, n_rep, t_max, t_trans, adaptive, name, store=None, table=None):
+    """ Runs the (μ, β) cells and returns P(β) of each one, in the same order.
+    Cells already in the store are not simulated again and new ones are appended to it.
+    With a profiling.SummaryTable, the step statistics of every simulated cell are added to it.
+    `seed` is the root seed of the sweep (part of the store key) and `seeds` the spawned seed of each cell. """
+    params = _params(seed, p_0, n_rep, t_max, t_trans, adaptive)
+
+    ps = {}
+    if store is not None:
+        for mu, beta in cells:
+            record = store.get(name, mu, beta, **params)
+            if record is not None:
+                ps[(mu, beta)] = record['p']
+
+    pending = [(cell, cell_seed) for cell, cell_seed in zip(cells, seeds) if cell not in ps]
+    if len(ps) > 0:
+        print(f'{name} - {len(ps)} cells already in the results store')
+
+    tasks = [(mu, beta, cell_seed, p_0, n_rep, t_max, t_trans, adaptive, table is not None) for (mu, beta), cell_seed in pending]
+    results = executor.map(_run_cell, tasks) if executor is not None else map(_run_cell, tasks)
+
+    for ((mu, beta), cell_seed), (stationary, steps_saved, rng_state, stats) in zip(pending, results):
+        ps[(mu, beta)] = float(np.mean(stationary))
+        print(f'{datetime.datetime.now()} - {name} -  mu {mu} - beta {str(beta)} - ended - {str(ps[(mu, beta)])} - steps saved per replica {np.mean(steps_saved):.1f}/{t_max}')
+
+        if table is not None:
+            table.add(name, mu, beta, stats)
+
+        if store is not None:
+            store.append(dict(network=name, mu=mu, beta=beta, **params,
+                              p=ps[(mu, beta)], skipped=False,
+                              replicas=stationary.tolist(),
+                              steps_saved=steps_saved.tolist(),
+                              seed={'entropy': cell_seed.entropy, 'spawn_key': list(cell_seed.spawn_key)},
+                              rng_state=rng_state))
+
+    return [ps[cell] for cell in cells]
+
+def run_sweep(network, betas, recover_probabilities, p_0, n_rep, t_max, t_trans, workers=None, seed=None, name='', adaptive=False, store=None, table=None):
+    """ Runs the Monte Carlo simulation of every (μ, β) pair in a pool of processes and
+    returns a dict recover_probability -> list with P(β) for each beta (same order as betas).
+
+    The compiled graph is sent once to each worker and every (μ, β) cell gets its own
+    random stream spawned from `seed`, so the result does not depend on the number of workers.
+
+    Keyword arguments:
+    network -- networkx graph or CSRGraph
+    betas -- infection probabilities
+    recover_probabilities -- recovery probabilities μ
+    p_0 -- initial fraction of infected nodes
+    n_rep -- number of repetitions
+    t_max -- maximum number of time steps
+    t_trans -- number of steps of the transitory
+    workers -- number of processes (default os.cpu_count(), 1 runs in this process)
+    seed -- root seed of the sweep (default None, non reproducible)
+    name -- network name used in the progress messages
+    adaptive -- stop the replicas on absorption or stationarity (default False)
+    store -- ResultStore used to skip the cells already simulated and save the new ones (default None)
+    table -- profiling.SummaryTable that receives the step statistics of each cell (default None)
+    """
+    graph = network if isinstance(network, CSRGraph) else CSRGraph.from_networkx(network)
+
+    cells = [(mu, beta) for mu in recover_probabilities for beta in betas]
+    seeds = np.random.SeedSequence(seed).spawn(len(cells))
+
+    executor = _executor(graph, workers)
+    try:
+        results = _simulate(executor, cells, seed, seeds, p_0, n_rep, t_max, t_trans, adaptive, name, store, table)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    ps = {mu: [] for mu in recover_probabilities}
+    for (mu, _), p in zip(cells, results):
+        ps[mu].append(p)
+
+    return ps
+
+def run_threshold_sweep(network, betas, recover_probabilities, p_0, n_rep, t_max, t_trans, workers=None, seed=None, name='', adaptive=False,
+                        skip_factor=0.5, n_refine=10, store=None, table=None):
+    """ Like run_sweep, but guided by the quenched mean-field threshold β_c = μ/Λ_max:
+    betas below skip_factor·β_c are not simulated (P(β) = 0) and, after the first pass,
+    n_refine betas are added at the midpoints of the intervals where P(β) changes the most.
+
+    Returns a dict recover_probability -> (betas, ps), both sorted by beta.
+
+    Keyword arguments:
+    (same as run_sweep)
+    skip_factor -- fraction of β_c below which betas are skipped (default 0.5)
+    n_refine -- number of betas added around the threshold for each μ (default 10)
+    """
+    graph = network if isinstance(network, CSRGraph) else CSRGraph.from_networkx(network)
+    seed_sequence = np.random.SeedSequence(seed)
+
+    curves = {}
+    executor = _executor(graph, workers)
+    try:
+        #Coarse pass
+        plan = {}
+        for mu in recover_probabilities:
+            beta_c = meanfield.qmf_threshold(graph, mu)
+            plan[mu] = meanfield.plan_betas(betas, beta_c, skip_factor)
+            print(f'{name} -  mu {mu} - QMF beta_c {beta_c:.4f} - skipping {len(plan[mu][1])} betas')
+
+        cells = [(mu, beta) for mu in recover_probabilities for beta in plan[mu][0]]
+        results = _simulate(executor, cells, seed, seed_sequence.spawn(len(cells)), p_0, n_rep, t_max, t_trans, adaptive, name, store, table)
+
+        for mu in recover_probabilities:
+            curves[mu] = {beta: 0.0 for beta in plan[mu][1]}
+
+            #Stored too (flagged), so the curves drawn from the store are the ones of this run
+            if store is not None:
+                params = _params(seed, p_0, n_rep, t_max, t_trans, adaptive)
+                for beta in plan[mu][1]:
+                    if store.get(name, mu, beta, **params, skipped=True) is None:
+                        store.append(dict(network=name, mu=mu, beta=beta, **params, p=0.0, skipped=True))
+        for (mu, beta), p in zip(cells, results):
+            curves[mu][beta] = p
+
+        #Refinement around the threshold
+        cells = []
+        for mu in recover_probabilities:
+            simulated = sorted(curves[mu])
+            new_betas = meanfield.refine_betas(simulated, [curves[mu][beta] for beta in simulated], n_refine)
+            cells += [(mu, beta) for beta in new_betas if beta not in curves[mu]]
+
+        results = _simulate(executor, cells, seed, seed_sequence.spawn(len(cells)), p_0, n_rep, t_max, t_trans, adaptive, name, store, table)
+        for (mu, beta), p in zip(cells, results):
+            curves[mu][beta] = p
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {mu: (sorted(curve), [curve[beta] for beta in sorted(curve)]) for mu, curve in curves.items()}
@@ -1,29 +1,45 @@
 import os
+import sys
 
-import matplotlib.pyplot as plt
 import networkx as nx
 
-def plot(network_path, p_sequence, betas, recover_probability, p_0):
+from A4_project.model.CSRGraph import CSRGraph
+
+#figures.py and pajek.py are shared with A2-models and A3-communities, in the common folder
+#at the root of the repository
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from common import figures
+from common.pajek import read_pajek
+
+def draw_p_beta(ax, netname, betas, p_sequence, recover_probability, p_0):
+    ax.plot(betas, p_sequence, 'o-')
+    ax.set_xlabel('β')
+    ax.set_ylabel('P')
+
+    ax.set_xlim(0, 1.0) 
+    ax.set_ylim(0, 1.0)
+
+    ax.grid()
+
+    ax.set_title(netname + ', SIS(μ=%.1f, P0=%.1f)' % (recover_probability, p_0))
+
+def plot(network_path, p_sequence, betas, recover_probability, p_0, batch=None):
+    """ Saves the P(β) image of a network and μ (nothing is drawn when the data did not change).
+
+    Keyword arguments:
+    batch -- FigureBatch to add the figure to instead of rendering it now (default None)
+    """
     netname = os.path.splitext(os.path.basename(network_path))[0]
     directory = os.path.join('A4_project/output/', 'images', netname)
-    
-    if not os.path.exists(directory):
-        os.makedirs(directory)
 
     out_file = os.path.join(directory,f'{netname}-{str(recover_probability)}.png') 
-    
-    plt.plot(betas, p_sequence, 'o-')
-    plt.xlabel('β')
-    plt.ylabel('P')
+    data = dict(netname=netname, betas=list(betas), p_sequence=list(p_sequence),
+                recover_probability=recover_probability, p_0=p_0)
 
-    plt.xlim(0, 1.0) 
-    plt.ylim(0, 1.0)
-
-    plt.grid()
-
-    plt.title(netname + ', SIS(μ=%.1f, P0=%.1f)' % (recover_probability, p_0))
-    plt.savefig(out_file)
-    plt.close()
+    if batch is not None:
+        batch.add(out_file, draw_p_beta, **data)
+    else:
+        figures.render(out_file, draw_p_beta, **data)
 
 def generate_betas(n_betas = 51, delta_b = .02):
     betas = [0.0]
@@ -37,3 +53,18 @@ def read_network(path):
     net = nx.Graph(pajek)
 
     return net
+
+def read_network_csr(path, cache=True):
+    """ Reads a Pajek file straight into a CSRGraph, without building a networkx graph
+    (arcs are taken as edges, weights are ignored).
+
+    The parsed arrays are cached in <path>.npz (see common/pajek.py read_pajek), so later
+    runs skip the parsing.
+
+    Keyword arguments:
+    path -- Pajek (.net) file
+    cache -- read/write the binary cache (default True)
+    """
+    parsed = read_pajek(path, cache)
+
+    return CSRGraph.from_edges(len(parsed['labels']), parsed['edges'], parsed['labels'])
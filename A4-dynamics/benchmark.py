@@ -0,0 +1,191 @@
+""" Benchmark of the SIS implementations.
+
+Times steps/sec and replicas/sec of every backend on generated ER/BA/WS graphs and on the
+networks of run.py, checks that the discrete-time backends give statistically equivalent
+P(β) and stores everything as JSON in A4_project/output/benchmarks/ (one file per run,
+named after the date and commit), so runs of different commits can be compared.
+
+Usage (from A4-dynamics):
+    python benchmark.py --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+
+import networkx as nx
+import numpy as np
+
+import A4_project.model.SIS as sis
+from A4_project.model.BatchSIS import BatchSIS
+from A4_project.model.CSRGraph import CSRGraph
+from A4_project.model.FastSIS import FastSIS
+from A4_project.model.GillespieSIS import GillespieSIS
+from A4_project.utils import utils
+
+networks_paths = ['A4_project/networks/real/PGP.net',
+                  'A4_project/networks/model/SF_1000_g2.7.net',
+                  'A4_project/networks/model/ER1000k8.net']
+
+backends = ['reference', 'fast', 'batch', 'gillespie']
+
+def generate_graph(model, n, avg_degree, seed):
+    if model == 'ER':
+        net = nx.fast_gnp_random_graph(n, avg_degree / (n - 1), seed=seed)
+    elif model == 'BA':
+        net = nx.barabasi_albert_graph(n, avg_degree // 2, seed=seed)
+    elif model == 'WS':
+        net = nx.watts_strogatz_graph(n, avg_degree, 0.1, seed=seed)
+    else:
+        raise Exception(f'Unknown model {model}')
+
+    return CSRGraph.from_edges(n, np.array(net.edges(), dtype=np.int64).reshape(-1, 2))
+
+def to_networkx(graph):
+    net = nx.Graph()
+    net.add_nodes_from(range(len(graph)))
+    src = np.repeat(np.arange(len(graph)), graph.degree())
+    net.add_edges_from(zip(src.tolist(), graph.indices.tolist()))
+    return net
+
+def make_model(backend, graph, seed):
+    if backend == 'reference':
+        #SIS draws from the module-level random generator
+        random.seed(seed)
+        return sis.SIS(to_networkx(graph))
+    if backend == 'fast':
+        return FastSIS(graph, seed=seed)
+    if backend == 'batch':
+        return BatchSIS(graph, seed=seed)
+    return GillespieSIS(graph, seed=seed)
+
+def time_backend(backend, graph, beta, mu, p_0, steps, n_rep, t_max, seed):
+    """ Returns steps/sec of one replica and replicas/sec of complete t_max runs. """
+    model = make_model(backend, graph, seed)
+    replicas = n_rep if backend == 'batch' else 1
+
+    if backend == 'batch':
+        model.set_initial_status(beta, mu, p_0, n_rep)
+    else:
+        model.set_initial_status(beta, mu, p_0)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.iterate()
+    elapsed = time.perf_counter() - start
+
+    return {'steps_per_sec': replicas * steps / elapsed, 'replicas_per_sec': replicas * steps / elapsed / t_max}
+
+def prevalence(backend, graph, beta, mu, p_0, n_rep, t_max, t_trans, seed):
+    """ Returns the stationary average of each replica. """
+    model = make_model(backend, graph, seed)
+
+    if backend == 'batch':
+        return model.run(beta, mu, p_0, n_rep, t_max, t_trans)
+
+    stationary = []
+    for _ in range(n_rep):
+        model.set_initial_status(beta, mu, p_0)
+        sim = [model.iterate()[0] for _ in range(t_max)]
+        stationary.append(np.mean(sim[t_trans:]))
+
+    return np.asarray(stationary)
+
+def equivalent(a, b, z=3.0, tol=1e-3):
+    """ Two sample test of the means of two sets of replicas. """
+    se = np.sqrt(a.var(ddof=1) / len(a) + b.var(ddof=1) / len(b))
+    return bool(abs(a.mean() - b.mean()) <= z * se + tol)
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the SIS implementations')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='sizes of the generated graphs')
+    parser.add_argument('--models', nargs='+', default=['ER', 'BA', 'WS'], help='generated graph models')
+    parser.add_argument('--avg-degree', type=int, default=8)
+    parser.add_argument('--backends', nargs='+', default=backends)
+    parser.add_argument('--no-files', action='store_true', help='skip the networks of run.py')
+    parser.add_argument('--beta', type=float, default=0.1)
+    parser.add_argument('--mu', type=float, default=0.5)
+    parser.add_argument('--p0', type=float, default=0.2)
+    parser.add_argument('--steps', type=int, default=20, help='timed steps per backend')
+    parser.add_argument('--n-rep', type=int, default=100, help='replicas of the batch backend')
+    parser.add_argument('--t-max', type=int, default=1000)
+    parser.add_argument('--max-reference-nodes', type=int, default=20000, help='largest graph timed with the reference backend')
+    parser.add_argument('--check-betas', type=float, nargs='*', default=[0.02, 0.1, 0.3], help='betas of the equivalence check')
+    parser.add_argument('--check-nodes', type=int, default=1000, help='largest graph of the equivalence check')
+    parser.add_argument('--check-reps', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='A4_project/output/benchmarks')
+    args = parser.parse_args()
+
+    graphs = []
+    for model in args.models:
+        for n in args.sizes:
+            graphs.append((f'{model}_n{n}_k{args.avg_degree}', lambda model=model, n=n: generate_graph(model, n, args.avg_degree, args.seed)))
+    if not args.no_files:
+        for path in networks_paths:
+            graphs.append((os.path.splitext(os.path.basename(path))[0], lambda path=path: utils.read_network_csr(path)))
+
+    timings = []
+    checks = []
+
+    for name, load in graphs:
+        graph = load()
+        print(f'{datetime.datetime.now()} - {name} - N={len(graph)} E={graph.number_of_edges()}')
+
+        for backend in args.backends:
+            if backend == 'reference' and len(graph) > args.max_reference_nodes:
+                continue
+
+            result = time_backend(backend, graph, args.beta, args.mu, args.p0, args.steps, args.n_rep, args.t_max, args.seed)
+            result.update(graph=name, nodes=len(graph), edges=graph.number_of_edges(), backend=backend)
+            timings.append(result)
+            print(f'    {backend:10s} {result["steps_per_sec"]:12.1f} steps/s {result["replicas_per_sec"]:10.3f} replicas/s')
+
+        #Statistical equivalence of the discrete-time backends (gillespie uses rates, not probabilities)
+        discrete = [backend for backend in args.backends if backend != 'gillespie']
+        if len(graph) <= args.check_nodes and len(discrete) > 1:
+            t_max = 200
+            t_trans = 100
+            for beta in args.check_betas:
+                ps = {backend: prevalence(backend, graph, beta, args.mu, args.p0, args.check_reps, t_max, t_trans, args.seed)
+                      for backend in discrete}
+                base = discrete[0]
+                for backend in discrete[1:]:
+                    check = {'graph': name, 'beta': beta, 'mu': args.mu, 'backend': backend, 'against': base,
+                             'p': float(ps[backend].mean()), 'p_against': float(ps[base].mean()),
+                             'equivalent': equivalent(ps[backend], ps[base])}
+                    checks.append(check)
+                    print(f'    beta {beta} {backend} vs {base}: {check["p"]:.4f} vs {check["p_against"]:.4f} - {"ok" if check["equivalent"] else "DIFFERENT"}')
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'args': vars(args),
+        'timings': timings,
+        'equivalence': checks,
+    }
+
+    if not os.path.exists(args.out):
+        os.makedirs(args.out)
+    out_file = os.path.join(args.out, f'{datetime.datetime.now():%Y%m%d-%H%M%S}-{commit}.json')
+    with open(out_file, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f'Results saved in {out_file}')
+
+if __name__ == '__main__':
+    main()
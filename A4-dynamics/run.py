@@ -3,7 +3,14 @@ import datetime
 import networkx as nx
 
 import A4_project.model.SIS as sis
+import A4_project.model.FastSIS as fast_sis
+import A4_project.model.GillespieSIS as gillespie_sis
+from A4_project.model.QSSIS import QuasiStationarySIS
+from A4_project.model.stationarity import run_replica
 from A4_project.utils import utils
+from A4_project.utils import sweep
+from A4_project.utils import profiling
+from A4_project.utils.store import ResultStore, plot_from_store
 
 #β (at least 51 values, Δβ=0.02)
 n_betas = 51
@@ -30,33 +37,125 @@ networks_paths = ['A4_project/networks/real/PGP.net', #largest network
 
 #networks_paths = ['A4_project/networks/model/SF_500_g2.7.net']
 
+#SIS implementation: 'reference' (pure python, SIS.SIS), 'fast' (numpy/CSR, FastSIS.FastSIS),
+#'batch' (all the repetitions at once, BatchSIS.BatchSIS) or 'gillespie' (continuous time,
+#β and μ used as rates, GillespieSIS.GillespieSIS)
+backend = 'batch'
+
+#number of processes for the 'batch' sweep (None = all the cores) and root seed of the sweep
+workers = None
+seed = None
+
+#stop each repetition when it gets absorbed or reaches the stationary regime
+adaptive = False
+
+#'batch' backend: skip the betas far below the mean-field threshold and refine the grid around it
+threshold_guided = False
+
+#'batch' backend: every simulated (network, μ, β) is appended to this file and skipped on restart
+results_path = 'A4_project/output/results.jsonl'
+
+#'batch' backend: only regenerate the images of this configuration from results_path, without simulating
+plot_only = False
+
+#record time, neighbour visits, random draws and process peak memory of every (network, μ, β) in instrumentation_path
+instrumentation = True
+instrumentation_path = 'A4_project/output/metrics/sis-steps.tsv'
+
+#whole run profiler: None, 'cprofile' or 'pyinstrument' (use workers = 1 to profile the simulation)
+profiler_tool = None
+
+#quasi-stationary method ('fast' backend): one QS run of t_max steps per β instead of n_rep repetitions
+quasi_stationary = False
+
+
+#QuasiStationarySIS runs on FastSIS only
+if quasi_stationary and backend != 'fast':
+    raise Exception(f"quasi_stationary needs backend = 'fast', not '{backend}'")
+
+#Only the 'batch' sweeps write results_path, the other backends can neither resume nor plot from it
+if plot_only and backend != 'batch':
+    raise Exception(f"plot_only needs backend = 'batch', not '{backend}'")
+
+if plot_only:
+    plot_from_store(results_path, workers, p_0=p_0, n_rep=n_rep, t_max=t_max, t_trans=t_trans,
+                    adaptive=adaptive, sweep_seed=seed, backend=backend)
+    networks_paths = []
+
+store = ResultStore(results_path) if backend == 'batch' else None
+table = profiling.SummaryTable() if instrumentation else None
+profiler = profiling.Profiler(profiler_tool, 'A4_project/output/profile').start()
 
 for network_path in networks_paths:
-    #networkx
-    network = utils.read_network(network_path)
+    #networkx for the reference implementation, cached CSR arrays for the others
+    network = utils.read_network(network_path) if backend == 'reference' else utils.read_network_csr(network_path)
     
-    s = sis.SIS(network)
     betas = utils.generate_betas(n_betas, delta_b)
+
+    if backend == 'batch' and threshold_guided:
+        curves = sweep.run_threshold_sweep(network, betas, recover_probabilities, p_0, n_rep, t_max, t_trans, workers, seed, network_path, adaptive, store=store, table=table)
+
+        for recover_probability, (betas_mu, ps) in curves.items():
+            utils.plot(network_path, ps, betas_mu, recover_probability, p_0)
+        continue
+
+    if backend == 'batch':
+        #All the (μ, β) pairs in parallel, each one with all its repetitions batched
+        ps_mu = sweep.run_sweep(network, betas, recover_probabilities, p_0, n_rep, t_max, t_trans, workers, seed, network_path, adaptive, store=store, table=table)
+
+        for recover_probability in recover_probabilities:
+            utils.plot(network_path, ps_mu[recover_probability], betas, recover_probability, p_0)
+        continue
+
+    if backend == 'gillespie':
+        s = gillespie_sis.GillespieSIS(network)
+    elif backend == 'fast':
+        s = fast_sis.FastSIS(network)
+    else:
+        s = sis.SIS(network)
+
+    if quasi_stationary:
+        qs = QuasiStationarySIS(s)
+
+        for recover_probability in recover_probabilities:
+            ps = []
+            chis = []
+            for beta in betas:
+                p_beta, chi = qs.run(beta, recover_probability, p_0, t_max, t_trans)
+                ps.append(p_beta)
+                chis.append(chi)
+
+                print(f'{datetime.datetime.now()} - {network_path} -  mu {recover_probability} - beta {str(beta)} - QS - {str(p_beta)} - chi {str(chi)}')
+
+            print(f'{network_path} -  mu {recover_probability} - threshold (max chi) beta_c ~ {betas[chis.index(max(chis))]}')
+            utils.plot(network_path, ps, betas, recover_probability, p_0)
+        continue
+
     for recover_probability in recover_probabilities:
         ps = []
         for beta in betas:
             print(f'{datetime.datetime.now()} - {network_path} -  mu {recover_probability} - beta {str(beta)} - started')
             #Monte Carlo
             p_beta = 0
+            steps_saved = 0
+            stats = profiling.instrument(s) if instrumentation else None
             for _ in range(n_rep):
-                s.set_initial_status(beta, recover_probability, p_0)
-                
-                sim = []
+                p_rep, saved = run_replica(s, beta, recover_probability, p_0, t_max, t_trans, adaptive)
+                p_beta += p_rep
+                steps_saved += saved
 
-                for _ in range(t_max):
-                    p, _ = s.iterate()
-                    sim.append(p)
-                
-                stationary = sim[t_trans:]
-                p_beta += sum(stationary)/len(stationary)
+            if table is not None:
+                table.add(network_path, recover_probability, beta, stats.finish())
 
             ps.append(p_beta/n_rep)
             
-            print(f'{datetime.datetime.now()} - {network_path} -  mu {recover_probability} - beta {str(beta)} - ended - {str(p_beta/n_rep)}') 
+            print(f'{datetime.datetime.now()} - {network_path} -  mu {recover_probability} - beta {str(beta)} - ended - {str(p_beta/n_rep)} - steps saved per replica {steps_saved/n_rep:.1f}/{t_max}')
 
         utils.plot(network_path, ps, betas, recover_probability, p_0)
+
+profiler.stop()
+
+#Nothing to save when every cell came from the store (or plot_only)
+if table is not None and table.rows:
+    print(table)
+    table.save(instrumentation_path)
@@ -0,0 +1,123 @@
+""" Figure rendering without pyplot.
+
+Figures are drawn on matplotlib Figure objects with the Agg canvas, so no global pyplot
+state (figure stack, current axes) is involved and nothing leaks between figures. A figure
+is a module-level draw(ax, **data) function plus its numeric data: FigureBatch collects
+them, skips the ones whose image exists and whose data hash has not changed (hashes are
+kept in a figures.json index next to the images) and renders the rest in a process pool.
+
+Shared by A2-models and A4-dynamics, which add the root of the repository to sys.path.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+_INDEX_NAME = 'figures.json'
+
+def _to_json(value):
+    #numpy arrays and scalars
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+def _code_hash(code):
+    #Bytecode, names and constants of a function, including its nested functions and comprehensions
+    digest = hashlib.sha1(code.co_code)
+    digest.update(repr(code.co_names).encode('utf-8'))
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            digest.update(_code_hash(const).encode('utf-8'))
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(const, key=repr)).encode('utf-8'))
+        else:
+            digest.update(repr(const).encode('utf-8'))
+    return digest.hexdigest()
+
+def data_hash(draw, data):
+    """ Hash of a figure: the draw function (name and code, so editing it redraws the
+    figure) and its data. """
+    content = json.dumps([draw.__module__, draw.__qualname__, _code_hash(draw.__code__), data], sort_keys=True, default=_to_json)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def _render(task):
+    out_file, draw, data = task
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    draw(fig.add_subplot(), **data)
+    fig.savefig(out_file, bbox_inches='tight')
+
+    return out_file
+
+def _read_index(directory):
+    path = os.path.join(directory, _INDEX_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _write_index(directory, index):
+    with open(os.path.join(directory, _INDEX_NAME), 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+
+class FigureBatch():
+    """ Figures to render together.
+
+    Keyword arguments:
+    workers -- number of processes (default all the cores, 1 renders in this process)
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.figures = []
+
+    def add(self, out_file, draw, **data):
+        """ Adds a figure: draw(ax, **data) will be rendered into out_file. draw must be a
+        module-level function so it can be sent to the workers. """
+        self.figures.append((out_file, draw, data))
+
+    def render(self):
+        """ Renders the figures whose data changed and returns their files. """
+        indexes = {}
+        tasks = []
+        hashes = {}
+
+        for out_file, draw, data in self.figures:
+            directory = os.path.dirname(out_file) or '.'
+            if directory not in indexes:
+                if not os.path.exists(directory):
+                    os.makedirs(directory)
+                indexes[directory] = _read_index(directory)
+
+            name = os.path.basename(out_file)
+            hashes[out_file] = data_hash(draw, data)
+            if indexes[directory].get(name) == hashes[out_file] and os.path.exists(out_file):
+                continue
+
+            tasks.append((out_file, draw, data))
+
+        if len(tasks) <= 1 or self.workers == 1:
+            rendered = [_render(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                rendered = list(executor.map(_render, tasks))
+
+        for out_file in rendered:
+            directory = os.path.dirname(out_file) or '.'
+            indexes[directory][os.path.basename(out_file)] = hashes[out_file]
+        for directory in {os.path.dirname(out_file) or '.' for out_file in rendered}:
+            _write_index(directory, indexes[directory])
+
+        self.figures = []
+
+        return rendered
+
+def render(out_file, draw, **data):
+    """ Renders a single figure (unless its data did not change) in this process. """
+    batch = FigureBatch(workers=1)
+    batch.add(out_file, draw, **data)
+    return batch.render()
@@ -0,0 +1,136 @@
+""" Pajek (.net) parsing into numpy arrays, with a binary cache.
+
+Shared by A3-communities and A4-dynamics, which add the root of the repository to sys.path.
+"""
+import os
+import re
+
+import numpy as np
+
+#Bump when the layout of the cached arrays changes
+_CACHE_VERSION = 2
+
+def _lines(body):
+    #Non empty lines, without the % comments
+    return [line.split() for line in body.splitlines() if line.strip() and not line.lstrip().startswith('%')]
+
+def _edges_block(lines):
+    #*Edges / *Arcs: i j [weight [attributes...]] per line
+    columns = {len(line) for line in lines}
+
+    if len(columns) == 1 and columns != {2}:
+        #Same number of columns in every line: parse the whole block at once
+        try:
+            values = np.array([value for line in lines for value in line], dtype=float).reshape(len(lines), -1)
+            return values[:, :2].astype(np.int64) - 1, values[:, 2]
+        except ValueError: #non numeric attributes
+            pass
+
+    edges = np.array([line[:2] for line in lines], dtype=np.int64).reshape(-1, 2) - 1
+    try:
+        weights = np.array([float(line[2]) for line in lines])
+    except (IndexError, ValueError):
+        weights = None
+
+    return edges, weights
+
+def _edges_list_block(lines):
+    #*Edgeslist / *Arcslist: i j k ... links i to each of j k ...
+    src = [int(line[0]) for line in lines for _ in line[1:]]
+    dst = [int(value) for line in lines for value in line[1:]]
+
+    return np.column_stack((np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64))).reshape(-1, 2) - 1
+
+def parse_pajek(path):
+    """ Parses a Pajek file once and returns its arrays: labels (list), edges ((m x 2) array of
+    0-based node indices), weights (array, or None when some edge has no weight), coords
+    ((n x 2) array of x y, or None when some node has no coordinates) and directed (*Arcs).
+
+    Other sections (*Network, *Partition...) are skipped, and only the first columns of the
+    edge lines are read (attributes such as "c Black" are ignored), as nx.read_pajek does.
+
+    Keyword arguments:
+    path -- Pajek (.net) file
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+
+    sections = re.split(r'^\*', text, flags=re.MULTILINE)
+    labels = None
+    coords = None
+    edges = []
+    weights = []
+    directed = False
+
+    for section in sections[1:]:
+        header, _, body = section.partition('\n')
+        if not header.split():
+            continue
+        keyword = header.split()[0].lower()
+
+        if keyword == 'vertices':
+            n = int(header.split()[1])
+            labels = [str(i) for i in range(1, n + 1)]
+            coords = np.full((n, 2), np.nan)
+            for line in body.splitlines():
+                #id "label" x y z  or  id label x y z
+                match = re.match(r'\s*(\d+)\s+(?:"([^"]*)"|(\S+))(.*)', line)
+                if match:
+                    i = int(match.group(1)) - 1
+                    labels[i] = match.group(2) if match.group(2) is not None else match.group(3)
+                    values = match.group(4).split()
+                    try:
+                        coords[i] = [float(values[0]), float(values[1])]
+                    except (IndexError, ValueError):
+                        pass
+
+        elif keyword in ('edges', 'arcs'):
+            directed = directed or keyword == 'arcs'
+            block_edges, block_weights = _edges_block(_lines(body))
+            edges.append(block_edges)
+            weights.append(block_weights)
+
+        elif keyword in ('edgeslist', 'arcslist'):
+            directed = directed or keyword == 'arcslist'
+            edges.append(_edges_list_block(_lines(body)))
+            weights.append(None)
+
+    if labels is None:
+        raise Exception(f'{path} is not a Pajek file (missing *Vertices)')
+
+    edges = np.concatenate(edges) if edges else np.zeros((0, 2), dtype=np.int64)
+    weights = np.concatenate(weights) if weights and all(w is not None for w in weights) else None
+    coords = None if np.isnan(coords).any() else coords
+
+    return {'labels': labels, 'edges': edges, 'weights': weights, 'coords': coords, 'directed': directed}
+
+def read_pajek(path, cache=True):
+    """ Returns parse_pajek(path), cached in <path>.npz keyed on the size and modification time
+    of the file, so later runs skip the parsing.
+
+    Keyword arguments:
+    path -- Pajek (.net) file
+    cache -- read/write the binary cache (default True)
+    """
+    cache_path = path + '.npz'
+    stat = os.stat(path)
+    key = np.array([_CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    if cache and os.path.exists(cache_path):
+        with np.load(cache_path, allow_pickle=False) as cached:
+            if np.array_equal(cached['key'], key):
+                return {'labels': cached['labels'].tolist(), 'edges': cached['edges'],
+                        'weights': cached['weights'] if cached['has_weights'] else None,
+                        'coords': cached['coords'] if cached['has_coords'] else None,
+                        'directed': bool(cached['directed'])}
+
+    parsed = parse_pajek(path)
+
+    if cache:
+        np.savez(cache_path, key=key, labels=np.array(parsed['labels'], dtype=str), edges=parsed['edges'],
+                 weights=parsed['weights'] if parsed['weights'] is not None else np.zeros(0),
+                 has_weights=parsed['weights'] is not None,
+                 coords=parsed['coords'] if parsed['coords'] is not None else np.zeros((0, 2)),
+                 has_coords=parsed['coords'] is not None, directed=parsed['directed'])
+
+    return parsed